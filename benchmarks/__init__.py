@@ -0,0 +1,4 @@
+"""
+Benchmarks of the library, run as modules from the repository root,
+for example `python -m benchmarks.render_pipeline`.
+"""
@@ -0,0 +1,120 @@
+"""
+Helpers shared by the benchmarks: timing, baseline comparison and the command line.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPOSITORY_PATH = (
+    Path(__file__).resolve().parent.parent / "examples" / "file_repository"
+)
+
+# differences below this are treated as noise when comparing with a baseline
+NOISE_FLOOR_MS = 1.0
+
+
+def measure(function: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Calls the function several times and returns its timings in milliseconds.
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return dict(
+        median_ms=round(statistics.median(timings), 3),
+        min_ms=round(min(timings), 3),
+    )
+
+
+def compare(
+    results: Dict[str, object], baseline: Dict[str, object], tolerance: float
+) -> List[str]:
+    """
+    Compares the fastest timings with the baseline, as they are the least affected by noise.
+
+    :return: Descriptions of the stages slower than the baseline by more than the tolerance.
+    """
+    regressions = []
+    for name, stages in results["cases"].items():
+        baseline_stages = baseline["cases"].get(name)
+        if baseline_stages is None:
+            continue
+        for stage, timings in stages.items():
+            if stage not in baseline_stages:
+                continue
+            current = timings["min_ms"]
+            previous = baseline_stages[stage]["min_ms"]
+            if (
+                current > previous * (1 + tolerance)
+                and current - previous > NOISE_FLOOR_MS
+            ):
+                regressions.append(
+                    f"{name} {stage}: {previous:.1f}ms -> {current:.1f}ms"
+                    f" (+{(current / previous - 1) * 100 if previous else 100:.0f}%)"
+                )
+    return regressions
+
+
+def run_cli(
+    description: str,
+    run: Callable[[argparse.Namespace], Dict[str, object]],
+    *,
+    repeat: int,
+    add_arguments: Optional[Callable[[argparse.ArgumentParser], None]] = None,
+) -> int:
+    """
+    Runs a benchmark with the common command line options, writes its results as JSON
+    and compares them with a baseline.
+
+    :param description: The docstring of the benchmark, its first line describes it.
+    :param run: Runs the benchmark with the parsed arguments and returns its results.
+    :param repeat: The default number of timed runs of each case.
+    :param add_arguments: Optional. Adds the options specific to the benchmark.
+
+    :return: The exit code, 1 if any case is slower than the baseline by more than the tolerance.
+    """
+    parser = argparse.ArgumentParser(description=description.strip().splitlines()[0])
+    parser.add_argument("--output", type=Path, help="file to write JSON results to")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative slowdown against the baseline (default: 0.2)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=repeat,
+        help=f"timed runs per case (default: {repeat})",
+    )
+    if add_arguments is not None:
+        add_arguments(parser)
+    arguments = parser.parse_args()
+
+    results = run(arguments)
+    serialized = json.dumps(results, indent=2, sort_keys=True)
+    if arguments.output:
+        arguments.output.write_text(serialized + "\n")
+    else:
+        print(serialized)
+
+    if arguments.baseline:
+        regressions = compare(
+            results, json.loads(arguments.baseline.read_text()), arguments.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+__all__ = ("REPOSITORY_PATH", "NOISE_FLOOR_MS", "measure", "compare", "run_cli")
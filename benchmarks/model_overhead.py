@@ -0,0 +1,142 @@
+"""
+Benchmark of the overhead of models on trusted code paths.
+
+Times the construction of geometry and color models, loading templates
+from `examples/file_repository`, a warm render at a tiny scale, where the pixel
+work is small, and the geometry computed by a render without any pixel work.
+
+Usage:
+    python -m benchmarks.model_overhead --output results.json
+    python -m benchmarks.model_overhead --baseline results.json --tolerance 0.2
+
+The exit code is 1 if any case is slower than the baseline by more than the tolerance.
+"""
+
+import platform
+import sys
+from io import BytesIO
+from typing import Dict
+
+import PIL
+import PIL.Image
+
+from mockup_engineer import (
+    BytesIOReader,
+    Color,
+    FileRepository,
+    PilRenderer,
+    Point2D,
+    Size2D,
+    TemplateStorage,
+)
+from mockup_engineer.renderers import FrameCache
+from .common import REPOSITORY_PATH, measure, run_cli
+
+# constructions per timed run, so timings are well above the timer resolution
+CONSTRUCTIONS = 10000
+# renders per timed run
+RENDERS = 20
+
+
+def benchmark_models(repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Times the construction of models through their public and trusted constructors.
+    """
+
+    def construct(factory):
+        def run():
+            for index in range(CONSTRUCTIONS):
+                factory(index + 1)
+
+        return measure(run, repeat)
+
+    results = dict(
+        size2d=construct(lambda value: Size2D(value, value)),
+        point2d=construct(lambda value: Point2D(value, value)),
+        color=construct(lambda value: Color("Midnight")),
+    )
+    # trusted constructors are missing on older revisions compared with a baseline
+    if hasattr(Size2D, "_new"):
+        results["size2d_trusted"] = construct(lambda value: Size2D._new(value, value))
+        results["point2d_trusted"] = construct(
+            lambda value: Point2D._new(value, value)
+        )
+    return results
+
+
+def benchmark_load(repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Times loading all templates of the example repository.
+    """
+    repository = FileRepository(REPOSITORY_PATH)
+    return dict(repository=measure(repository.load, repeat))
+
+
+def benchmark_render(repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Times warm renders at a tiny scale, and the geometry computed by renders
+    on a warm plan without any pixel work.
+    """
+    storage = TemplateStorage()
+    storage.import_from_repository(FileRepository(REPOSITORY_PATH))
+    template = list(storage)[0].templates[0]
+    buffer = BytesIO()
+    PIL.Image.new("RGB", (117, 253), (32, 64, 128)).save(buffer, "PNG")
+    screenshot = BytesIOReader(BytesIO(buffer.getvalue()))
+
+    def render():
+        for _ in range(RENDERS):
+            PilRenderer.render(template, screenshot, scale=0.05)
+
+    image = PilRenderer.from_bytes(buffer.getvalue())
+    plan = PilRenderer.compile(template, portrait=True)
+
+    def geometry():
+        for _ in range(CONSTRUCTIONS // 10):
+            size = image.size
+            PilRenderer._screenshot_size_hint((plan,))  # noqa
+            prepared_size = PilRenderer._prepared_size(size, plan, True)  # noqa
+            PilRenderer._screenshot_start_point(plan, prepared_size)  # noqa
+
+    render()
+    return dict(tiny=measure(render, repeat), geometry=measure(geometry, repeat))
+
+
+def run(*, repeat: int) -> Dict[str, object]:
+    """
+    Runs all benchmark cases.
+    """
+    PilRenderer.frame_cache = FrameCache()
+    cases = dict(
+        models=benchmark_models(repeat),
+        load=benchmark_load(repeat),
+        render=benchmark_render(repeat),
+    )
+    for name, stages in cases.items():
+        print(
+            name,
+            " ".join(
+                f"{stage}={timings['median_ms']:.1f}ms"
+                for stage, timings in stages.items()
+            ),
+            file=sys.stderr,
+        )
+    return dict(
+        meta=dict(
+            python=platform.python_version(),
+            pillow=PIL.__version__,
+            platform=platform.platform(),
+            repeat=repeat,
+            constructions=CONSTRUCTIONS,
+            renders=RENDERS,
+        ),
+        cases=cases,
+    )
+
+
+def main() -> int:
+    return run_cli(__doc__, lambda arguments: run(repeat=arguments.repeat), repeat=5)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
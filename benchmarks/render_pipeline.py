@@ -0,0 +1,253 @@
+"""
+Benchmark of the render pipeline stages of PilRenderer.
+
+Templates are taken from `examples/file_repository`, screenshots are synthesized
+in several sizes and aspect ratios. Every case is rendered with and without
+a mask and with `constrain_proportions` on and off, and the decode, compile,
+resize, composite and encode stages are timed separately.
+
+Usage:
+    python -m benchmarks.render_pipeline --output results.json
+    python -m benchmarks.render_pipeline --baseline results.json --tolerance 0.2
+
+The exit code is 1 if any stage is slower than the baseline by more than the tolerance.
+"""
+
+import argparse
+import platform
+import sys
+from io import BytesIO
+from typing import Dict, Tuple
+from uuid import uuid4
+
+import PIL
+import PIL.Image
+import PIL.ImageDraw
+
+from mockup_engineer import (
+    BytesIOReader,
+    Device,
+    EncodePreset,
+    FileRepository,
+    ImageFormat,
+    PilRenderer,
+    Template,
+    TemplateStorage,
+)
+from mockup_engineer.renderers import FrameCache
+from .common import REPOSITORY_PATH, measure, run_cli
+
+# name, size, format
+SCREENSHOTS: Tuple[Tuple[str, Tuple[int, int], str], ...] = (
+    ("phone-portrait", (1170, 2532), "PNG"),
+    ("phone-landscape", (2532, 1170), "PNG"),
+    ("small-portrait", (750, 1334), "PNG"),
+    ("square", (1080, 1080), "PNG"),
+    ("photo-large", (3024, 4032), "JPEG"),
+)
+STAGES = ("decode", "compile_cold", "compile_warm", "resize", "composite", "encode")
+
+
+def make_screenshot(size: Tuple[int, int], format: str) -> bytes:  # noqa
+    """
+    Synthesizes an encoded screenshot with gradients, shapes and noise,
+    so encoders and resamplers can't take shortcuts on flat areas.
+    """
+    width, height = size
+    gradient = PIL.Image.linear_gradient("L").resize(size)
+    image = PIL.Image.merge(
+        "RGB",
+        (
+            gradient,
+            gradient.transpose(PIL.Image.Transpose.ROTATE_90).resize(size),
+            PIL.Image.effect_noise(size, 64),
+        ),
+    )
+    draw = PIL.ImageDraw.Draw(image)
+    for index in range(12):
+        left, top = width * index // 12, height * index // 12
+        draw.rectangle(
+            (left, top, left + width // 6, top + height // 10),
+            fill=(index * 20, 255 - index * 20, 128),
+        )
+    buffer = BytesIO()
+    image.save(buffer, format)
+    return buffer.getvalue()
+
+
+def make_masked_template(template: Template) -> Template:
+    """
+    Creates a copy of the template with a rounded screen mask.
+
+    The copy belongs to a detached copy of the device, so the device
+    and the storage it was appended to are not changed.
+    """
+    with PIL.Image.open(template.frame.path) as frame:
+        size = frame.size
+    mask = PIL.Image.new("L", size, 0)
+    PIL.ImageDraw.Draw(mask).rounded_rectangle(
+        (0, 0, size[0] - 1, size[1] - 1), radius=min(size) // 8, fill=255
+    )
+    buffer = BytesIO()
+    mask.save(buffer, "PNG")
+    # rendering needs the device, which tells whether the template can rotate
+    device = Device(
+        id=uuid4(),
+        manufacturer=template.device.manufacturer,
+        name=template.device.name,
+        type=template.device.type,
+        resolution=template.device.resolution,
+        released_at=template.device.released_at,
+        can_rotate=template.device.can_rotate,
+    )
+    return Template(
+        id=uuid4(),
+        color=template.color,
+        screenshot_start_point=template.screenshot_start_point,
+        screenshot_size=template.screenshot_size,
+        frame=template.frame,
+        mask=BytesIOReader(BytesIO(buffer.getvalue())),
+        device=device,
+    )
+
+
+def benchmark_case(
+    template: Template,
+    screenshot: bytes,
+    *,
+    constrain_proportions: bool,
+    repeat: int,
+    preset: EncodePreset,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Times the stages of a single render.
+    """
+    screenshot_size = PilRenderer.probe_size(screenshot)
+    portrait = screenshot_size.width <= screenshot_size.height
+
+    def compile_cold():
+        PilRenderer.frame_cache.clear()
+        return PilRenderer.compile(template, portrait=portrait)
+
+    results = dict(compile_cold=measure(compile_cold, repeat))
+    plan = PilRenderer.compile(template, portrait=portrait)
+    results["compile_warm"] = measure(
+        lambda: PilRenderer.compile(template, portrait=portrait), repeat
+    )
+
+    size_hint = PilRenderer._screenshot_size_hint((plan,))  # noqa
+    results["decode"] = measure(
+        lambda: PilRenderer.from_bytes(screenshot, size_hint=size_hint), repeat
+    )
+    decoded = PilRenderer.from_bytes(screenshot, size_hint=size_hint)
+    results["resize"] = measure(
+        lambda: PilRenderer._prepare_screenshot(  # noqa
+            decoded.copy(), plan, constrain_proportions=constrain_proportions
+        ),
+        repeat,
+    )
+    prepared = PilRenderer._prepare_screenshot(  # noqa
+        decoded.copy(), plan, constrain_proportions=constrain_proportions
+    )
+    results["composite"] = measure(
+        lambda: PilRenderer._composite(plan, prepared), repeat  # noqa
+    )
+    rendered = PilRenderer._composite(plan, prepared)  # noqa
+    results["encode"] = measure(
+        lambda: rendered.encode(format=ImageFormat.PNG, preset=preset), repeat
+    )
+    return results
+
+
+def run(
+    *, repeat: int, all_devices: bool, preset: EncodePreset
+) -> Dict[str, object]:
+    """
+    Runs all benchmark cases.
+    """
+    PilRenderer.frame_cache = FrameCache()
+    storage = TemplateStorage()
+    storage.import_from_repository(FileRepository(REPOSITORY_PATH))
+    devices = list(storage) if all_devices else list(storage)[:1]
+    templates = [
+        (device.name.replace(" ", "-").lower(), device.templates[0])
+        for device in devices
+    ]
+    screenshots = [
+        (name, make_screenshot(size, format)) for name, size, format in SCREENSHOTS
+    ]
+
+    cases = dict()
+    for template_name, template in templates:
+        masked_template = make_masked_template(template)
+        for screenshot_name, screenshot in screenshots:
+            for mask_name, case_template in (
+                ("unmasked", template),
+                ("masked", masked_template),
+            ):
+                for constrain_proportions in (False, True):
+                    name = "/".join(
+                        (
+                            template_name,
+                            screenshot_name,
+                            mask_name,
+                            "constrained" if constrain_proportions else "filled",
+                        )
+                    )
+                    cases[name] = benchmark_case(
+                        case_template,
+                        screenshot,
+                        constrain_proportions=constrain_proportions,
+                        repeat=repeat,
+                        preset=preset,
+                    )
+                    print(
+                        name,
+                        " ".join(
+                            f"{stage}={cases[name][stage]['median_ms']:.1f}ms"
+                            for stage in STAGES
+                        ),
+                        file=sys.stderr,
+                    )
+
+    return dict(
+        meta=dict(
+            python=platform.python_version(),
+            pillow=PIL.__version__,
+            platform=platform.platform(),
+            repeat=repeat,
+            preset=preset.value,
+        ),
+        cases=cases,
+    )
+
+
+def main() -> int:
+    def add_arguments(parser: argparse.ArgumentParser):
+        parser.add_argument(
+            "--all-devices",
+            action="store_true",
+            help="benchmark a template of every device instead of the first one",
+        )
+        parser.add_argument(
+            "--preset",
+            type=EncodePreset,
+            default=EncodePreset.BALANCED,
+            choices=list(EncodePreset),
+            help="PNG encoding preset of the encode stage (default: balanced)",
+        )
+
+    return run_cli(
+        __doc__,
+        lambda arguments: run(
+            repeat=arguments.repeat,
+            all_devices=arguments.all_devices,
+            preset=arguments.preset,
+        ),
+        repeat=3,
+        add_arguments=add_arguments,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,8 @@
 from .enums.device_type import DeviceType  # isort:skip
+from .enums.encode_preset import EncodePreset  # isort:skip
+from .enums.image_format import ImageFormat  # isort:skip
+from .enums.resampling import Resampling  # isort:skip
+from .enums.render_stage import RenderStage  # isort:skip
 from .models.device import Device  # isort:skip
 from .models.template import Template  # isort:skip
 from .models.color import Color  # isort:skip
@@ -9,20 +13,27 @@ from .readers.io.bytesio import BytesIOReader  # isort:skip
 from .readers.io.file import FileReader  # isort:skip
 from .readers.remote_http.requests import RequestsReader  # isort:skip
 from .renderers.pillow import PilRenderer  # isort:skip
+from .renderers.numpy import NumpyRenderer  # isort:skip
 from .repositories.asyncify import AsyncifyRepository  # isort:skip
 from .repositories.io.bytesio import BytesIORepository  # isort:skip
 from .repositories.io.file import FileRepository  # isort:skip
 from .repositories.remote_http.requests import RequestsRepository  # isort:skip
 from .template_storage import TemplateStorage  # isort:skip
+from .render_pool import RenderPool  # isort:skip
 
 __all__ = (
     "DeviceType",
+    "EncodePreset",
+    "ImageFormat",
+    "Resampling",
+    "RenderStage",
     "Color",
     "Size2D",
     "Point2D",
     "Device",
     "Template",
     "PilRenderer",
+    "NumpyRenderer",
     "AsyncifyReader",
     "BytesIOReader",
     "FileReader",
@@ -32,4 +43,5 @@ __all__ = (
     "FileRepository",
     "RequestsRepository",
     "TemplateStorage",
+    "RenderPool",
 )
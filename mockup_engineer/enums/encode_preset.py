@@ -0,0 +1,18 @@
+from . import RestorableStrEnum
+
+
+class EncodePreset(RestorableStrEnum):
+    """
+    Enumeration representing trade-offs between encoding speed and output size.
+
+    :cvar FAST: Encode as fast as possible at the cost of a larger output.
+    :cvar BALANCED: Default trade-off of the encoder.
+    :cvar SMALL: Spend more time to produce a smaller output.
+    """
+
+    FAST = "fast"
+    BALANCED = "balanced"
+    SMALL = "small"
+
+
+__all__ = ("EncodePreset",)
@@ -0,0 +1,18 @@
+from . import RestorableStrEnum
+
+
+class ImageFormat(RestorableStrEnum):
+    """
+    Enumeration representing formats of encoded images.
+
+    :cvar PNG: Lossless format with alpha channel.
+    :cvar WEBP: Lossy format with alpha channel.
+    :cvar JPEG: Lossy format without alpha channel.
+    """
+
+    PNG = "png"
+    WEBP = "webp"
+    JPEG = "jpeg"
+
+
+__all__ = ("ImageFormat",)
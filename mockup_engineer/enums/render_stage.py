@@ -0,0 +1,29 @@
+from . import RestorableStrEnum
+
+
+class RenderStage(RestorableStrEnum):
+    """
+    Enumeration representing stages of the render pipeline reported to render observers.
+
+    :cvar READ: Reading the encoded screenshot.
+    :cvar LOAD: Decoding a frame or mask of the template from the disk frame cache or its reader,
+                when its render plan is built.
+    :cvar COMPILE: Building or fetching the render plan of the template.
+    :cvar DECODE: Decoding the screenshot.
+    :cvar RESIZE: Resizing the screenshot to fit the screen of the template.
+    :cvar COMPOSITE: Compositing the screenshot with the frame.
+    :cvar CACHE: Looking up the encoded result in the result cache.
+    :cvar ENCODE: Encoding the rendered image.
+    """
+
+    READ = "read"
+    LOAD = "load"
+    COMPILE = "compile"
+    DECODE = "decode"
+    RESIZE = "resize"
+    COMPOSITE = "composite"
+    CACHE = "cache"
+    ENCODE = "encode"
+
+
+__all__ = ("RenderStage",)
@@ -0,0 +1,28 @@
+from . import RestorableStrEnum
+
+
+class Resampling(RestorableStrEnum):
+    """
+    Enumeration representing resampling filters used to resize images.
+
+    :cvar NEAREST: Nearest neighbour, the fastest and the roughest filter.
+    :cvar BOX: Box filter, each source pixel contributes with the same weight.
+    :cvar BILINEAR: Bilinear filter.
+    :cvar HAMMING: Hamming filter, sharper than bilinear at about the same speed.
+    :cvar BICUBIC: Bicubic filter, the default.
+    :cvar LANCZOS: Lanczos filter, the sharpest and the slowest filter.
+    :cvar FAST: Bilinear filter with a box pre-reduction for large downscales, for previews.
+    :cvar QUALITY: Lanczos filter without any pre-reduction.
+    """
+
+    NEAREST = "nearest"
+    BOX = "box"
+    BILINEAR = "bilinear"
+    HAMMING = "hamming"
+    BICUBIC = "bicubic"
+    LANCZOS = "lanczos"
+    FAST = "fast"
+    QUALITY = "quality"
+
+
+__all__ = ("Resampling",)
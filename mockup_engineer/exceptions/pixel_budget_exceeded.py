@@ -0,0 +1,14 @@
+from pydantic import validate_call, constr
+
+
+class PixelBudgetExceeded(Exception):
+    """
+    Exception raised when an image is too large to be decoded within the pixel budget.
+    """
+
+    @validate_call
+    def __init__(self, __message: constr(min_length=1) = "Pixel budget exceeded", /):
+        super().__init__(__message)
+
+
+__all__ = ("PixelBudgetExceeded",)
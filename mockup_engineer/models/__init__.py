@@ -1,14 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, Sequence, Dict, TypeVar, Type, Protocol
+from typing import Tuple, Sequence, Dict, TypeVar, Type, Protocol, Any
+from weakref import WeakValueDictionary
 
 T = TypeVar("T", bound="RestorableModel")
 
+# immutable values of the catalog by their type and serialized arguments,
+# which don't refer to the values, so a value is dropped with its last user
+_SHARED: "WeakValueDictionary[Tuple[type, Tuple, Tuple], Any]" = WeakValueDictionary()
+
 
 class RestorableModel(Protocol):
     """
     Protocol for restorable models.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def dump(self) -> Tuple[Sequence, Dict]:
         """
@@ -32,9 +39,25 @@ class BaseRestorableModel(RestorableModel, ABC):
     Abstract base class for restorable models.
     """
 
+    __slots__ = ()
+
     @classmethod
     def load(cls: Type[T], __args_kwargs: Tuple[Sequence, Dict], /) -> T:
         return cls(*__args_kwargs[0], **__args_kwargs[1])
 
 
+def _shared(__value: T, /) -> T:
+    """
+    Returns the shared instance equal to the immutable value,
+    so equal sizes, points and colors of a catalog are stored once.
+
+    :param __value: The immutable value, which must support weak references.
+    :return: The first living instance of the same type equal to the value.
+    """
+    args, kwargs = __value.dump()
+    return _SHARED.setdefault(
+        (type(__value), tuple(args), tuple(kwargs.items())), __value
+    )
+
+
 __all__ = ("RestorableModel", "BaseRestorableModel")
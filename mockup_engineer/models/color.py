@@ -1,4 +1,4 @@
-from typing import Optional, Tuple, Sequence, Dict
+from typing import Optional, Tuple, Sequence, Dict, Self
 
 from pydantic import validate_call, constr
 
@@ -17,15 +17,22 @@ EMOJI_MAPPER = {
 }
 
 
+@validate_call
+def _validate(
+    __name: constr(min_length=1), __emoji: Optional[constr(min_length=1)], /
+) -> Tuple[str, Optional[str]]:
+    return __name, __emoji
+
+
 class Color(BaseRestorableModel):
     """
     Class representing a color.
+
+    Colors are immutable and hashable, and can be shared between threads.
     """
 
-    __name: str
-    __emoji: Optional[str]
+    __slots__ = ("__name", "__emoji", "__weakref__")
 
-    @validate_call
     def __init__(
         self,
         __name: constr(min_length=1),
@@ -39,8 +46,28 @@ class Color(BaseRestorableModel):
                       If not provided, it will be automatically determined
                       based on the color name.
         """
-        self.__name = __name  # get, set
-        self.__emoji = emoji  # get, set
+        # non-empty strings are accepted as is, anything else is validated
+        if not (
+            type(__name) is str
+            and __name
+            and (emoji is None or (type(emoji) is str and emoji))
+        ):
+            __name, emoji = _validate(__name, emoji)
+        self.__name = __name  # get
+        self.__emoji = emoji  # get
+
+    @classmethod
+    def _new(cls, __name: str, /, emoji: Optional[str] = None) -> Self:
+        """
+        Creates a color without validation, for values computed by the library.
+
+        :param __name: The name of the color, a non-empty string.
+        :param emoji: Optional. The emoji representation of the color, a non-empty string.
+        """
+        color = object.__new__(cls)
+        color.__name = __name
+        color.__emoji = emoji
+        return color
 
     @property
     def name(self) -> str:
@@ -50,16 +77,6 @@ class Color(BaseRestorableModel):
 
         return self.__name
 
-    @name.setter
-    @validate_call
-    def name(self, __name: constr(min_length=1), /):
-        """
-        Set the name of the color.
-
-        :param __name: The name of the color.
-        """
-        self.__name = __name
-
     @property
     def emoji(self) -> str:
         """
@@ -73,17 +90,13 @@ class Color(BaseRestorableModel):
 
         return self.__get_emoji()
 
-    @emoji.setter
-    @validate_call
-    def emoji(self, __emoji: Optional[constr(min_length=1)], /):
-        """
-        Set the emoji representation of the color.
+    def __eq__(self, __other: object, /) -> bool:
+        if not isinstance(__other, Color):
+            return NotImplemented
+        return self.__name == __other.__name and self.__emoji == __other.__emoji
 
-        :param __emoji: Optional. The emoji representation of the color.
-                        If not provided, it will be automatically determined
-                        based on the color name.
-        """
-        self.__emoji = __emoji
+    def __hash__(self) -> int:
+        return hash((Color, self.__name, self.__emoji))
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.name!r}, emoji={self.__emoji!r})"
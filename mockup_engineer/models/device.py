@@ -1,7 +1,8 @@
+import sys
+from contextlib import contextmanager
 from datetime import date
 from typing import (
     Optional,
-    List,
     TYPE_CHECKING,
     Iterator,
     Sequence,
@@ -9,18 +10,21 @@ from typing import (
     Dict,
     Self,
     Iterable,
+    Any,
 )
 from uuid import UUID
 
 from pydantic import validate_call, ConfigDict, UUID4, constr, SkipValidation
 
-from . import BaseRestorableModel
+from . import BaseRestorableModel, _shared
 from .size2d import Size2D
 from ..enums.device_type import DeviceType
+from ..exceptions.duplicate_identifier import DuplicateIdentifier
 from ..exceptions.template_not_found import TemplateNotFound
 
 if TYPE_CHECKING:
     from .template import Template
+    from ..template_storage import TemplateStorage
 
 
 _MANUFACTURER_VALIDATOR = constr(min_length=1)
@@ -30,8 +34,23 @@ _NAME_VALIDATOR = constr(min_length=1)
 class Device(BaseRestorableModel, Iterable["Template"]):
     """
     Class representing a device.
+
+    Devices are slotted, with interned manufacturers and names
+    and shared resolutions, so large catalogs stay compact in memory.
     """
 
+    __slots__ = (
+        "__id",
+        "__manufacturer",
+        "__name",
+        "__type",
+        "__resolution",
+        "__released_at",
+        "__can_rotate",
+        "__templates",
+        "__storage",
+    )
+
     __id: UUID
     __manufacturer: str
     __name: str
@@ -40,7 +59,8 @@ class Device(BaseRestorableModel, Iterable["Template"]):
     __released_at: Optional[date]
     __can_rotate: bool
 
-    __templates: List["Template"]
+    __templates: Dict[UUID, "Template"]
+    __storage: Optional["TemplateStorage"]
 
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
     def __init__(
@@ -64,13 +84,16 @@ class Device(BaseRestorableModel, Iterable["Template"]):
         :param can_rotate: Optional. Indicates if the device can rotate.
         """
         self.__id = id  # get, set
-        self.__manufacturer = manufacturer  # get, set
-        self.__name = name  # get, set
+        self.__manufacturer = sys.intern(manufacturer)  # get, set
+        self.__name = sys.intern(name)  # get, set
         self.__type = type  # get, set
-        self.__resolution = resolution  # get, set
+        self.__resolution = _shared(resolution)  # get, set
         self.__released_at = released_at  # get, set
         self.__can_rotate = can_rotate
-        self.__templates = list()
+        # templates by ID, in the order they were associated with the device
+        self.__templates = dict()
+        # the storage the device was appended to, kept by the storage
+        self.__storage = None
 
     @property
     def id(self) -> UUID:
@@ -86,7 +109,22 @@ class Device(BaseRestorableModel, Iterable["Template"]):
         Set the unique identifier of the device.
 
         :param __id: The unique identifier of the device.
-        """
+        :raises DuplicateIdentifier: If the storage of the device has another device with the same ID.
+        """
+        if __id == self.__id:
+            return
+        if self.__storage is not None:
+            devices = self.__storage._TemplateStorage__devices  # noqa
+            if __id in devices:
+                raise DuplicateIdentifier(
+                    "Can't change device id because "
+                    f"device with id {__id!r} already exists"
+                )
+            # the index is rebuilt to keep the order of devices in the storage
+            self.__storage._TemplateStorage__devices = {  # noqa
+                __id if device_id == self.__id else device_id: device
+                for device_id, device in devices.items()
+            }
         self.__id = __id
 
     @property
@@ -104,7 +142,8 @@ class Device(BaseRestorableModel, Iterable["Template"]):
 
         :param __manufacturer: The manufacturer of the device.
         """
-        self.__manufacturer = __manufacturer
+        with self.__reindex():
+            self.__manufacturer = sys.intern(__manufacturer)
 
     @property
     def name(self) -> str:
@@ -121,7 +160,7 @@ class Device(BaseRestorableModel, Iterable["Template"]):
 
         :param __name: The name of the device.
         """
-        self.__name = __name
+        self.__name = sys.intern(__name)
 
     @property
     def type(self) -> DeviceType:
@@ -136,7 +175,8 @@ class Device(BaseRestorableModel, Iterable["Template"]):
 
         :param __type: The type of the device.
         """
-        self.__type = __type
+        with self.__reindex():
+            self.__type = __type
 
     @property
     def resolution(self) -> Size2D:
@@ -153,7 +193,8 @@ class Device(BaseRestorableModel, Iterable["Template"]):
 
         :param __resolution: The resolution of the device.
         """
-        self.__resolution = __resolution
+        with self.__reindex():
+            self.__resolution = _shared(__resolution)
 
     @property
     def released_at(self) -> Optional[date]:
@@ -170,7 +211,8 @@ class Device(BaseRestorableModel, Iterable["Template"]):
 
         :param __released_at: Optional. The release date of the device.
         """
-        self.__released_at = __released_at
+        with self.__reindex():
+            self.__released_at = __released_at
 
     @property
     def can_rotate(self) -> bool:
@@ -189,8 +231,23 @@ class Device(BaseRestorableModel, Iterable["Template"]):
         """
         self.__can_rotate = __can_rotate
 
+    @contextmanager
+    def __reindex(self) -> Iterator[None]:
+        """
+        Removes the device from the indexes of the storage
+        while indexed fields of the device change.
+        """
+        if self.__storage is None:
+            yield
+            return
+        self.__storage._unindex_device(self)  # noqa
+        try:
+            yield
+        finally:
+            self.__storage._index_device(self)  # noqa
+
     def __iter__(self) -> Iterator["Template"]:
-        return iter(self.__templates)
+        return iter(self.__templates.values())
 
     @property
     def templates(self) -> Sequence["Template"]:
@@ -208,10 +265,9 @@ class Device(BaseRestorableModel, Iterable["Template"]):
         :return: The template associated with the device.
         :raises TemplateNotFound: If the template with the specified ID is not found.
         """
-        for template in self:
-            if template.id == __id:
-                return template
-        raise TemplateNotFound(f"Template with id {__id!r} is not found")
+        if (template := self.__templates.get(__id)) is None:
+            raise TemplateNotFound(f"Template with id {__id!r} is not found")
+        return template
 
     def __repr__(self) -> str:
         return (
@@ -225,6 +281,12 @@ class Device(BaseRestorableModel, Iterable["Template"]):
             f"can_rotate={self.can_rotate!r})"
         )
 
+    def __getstate__(self) -> Tuple[None, Dict[str, Any]]:
+        _, state = super().__getstate__()
+        # storages are not pickled, an unpickled device is not in any storage
+        state["_Device__storage"] = None
+        return None, state
+
     def dump(self) -> Tuple[Sequence, Dict]:
         return tuple(), dict(
             id=str(self.__id),
@@ -1,4 +1,4 @@
-from typing import Tuple, Sequence, Dict
+from typing import Tuple, Sequence, Dict, Self
 
 from pydantic import validate_call, conint
 
@@ -8,15 +8,20 @@ _X_VALIDATOR = conint(ge=0)
 _Y_VALIDATOR = conint(ge=0)
 
 
+@validate_call
+def _validate(__x: _X_VALIDATOR, __y: _Y_VALIDATOR, /) -> Tuple[int, int]:
+    return __x, __y
+
+
 class Point2D(BaseRestorableModel):
     """
     Class representing a 2-dimensional point.
+
+    Points are immutable and hashable, and can be shared between threads.
     """
 
-    __x: int
-    __y: int
+    __slots__ = ("__x", "__y", "__weakref__")
 
-    @validate_call
     def __init__(
         self,
         __x: _X_VALIDATOR,
@@ -27,8 +32,24 @@ class Point2D(BaseRestorableModel):
         :param __x: The x-coordinate of the point.
         :param __y: The y-coordinate of the point.
         """
-        self.__x = __x  # get, set
-        self.__y = __y  # get, set
+        # non-negative integers are accepted as is, anything else is validated and coerced
+        if not (type(__x) is int and type(__y) is int and __x >= 0 and __y >= 0):
+            __x, __y = _validate(__x, __y)
+        self.__x = __x  # get
+        self.__y = __y  # get
+
+    @classmethod
+    def _new(cls, __x: int, __y: int, /) -> Self:
+        """
+        Creates a point without validation, for values computed by the library.
+
+        :param __x: The x-coordinate of the point, a non-negative integer.
+        :param __y: The y-coordinate of the point, a non-negative integer.
+        """
+        point = object.__new__(cls)
+        point.__x = __x
+        point.__y = __y
+        return point
 
     @property
     def x(self) -> _X_VALIDATOR:
@@ -37,16 +58,6 @@ class Point2D(BaseRestorableModel):
         """
         return self.__x
 
-    @x.setter
-    @validate_call
-    def x(self, __x: _X_VALIDATOR, /):
-        """
-        Set the x-coordinate of the point.
-
-        :param __x: The x-coordinate of the point.
-        """
-        self.__x = __x
-
     @property
     def y(self) -> _Y_VALIDATOR:
         """
@@ -54,15 +65,13 @@ class Point2D(BaseRestorableModel):
         """
         return self.__y
 
-    @y.setter
-    @validate_call
-    def y(self, __y: _Y_VALIDATOR, /):
-        """
-        Set the y-coordinate of the point.
+    def __eq__(self, __other: object, /) -> bool:
+        if not isinstance(__other, Point2D):
+            return NotImplemented
+        return self.__x == __other.__x and self.__y == __other.__y
 
-        :param __y: The y-coordinate of the point.
-        """
-        self.__y = __y
+    def __hash__(self) -> int:
+        return hash((Point2D, self.__x, self.__y))
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.__x!r}, {self.__y!r})"
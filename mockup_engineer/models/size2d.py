@@ -1,4 +1,4 @@
-from typing import Tuple, Sequence, Dict
+from typing import Tuple, Sequence, Dict, Self
 
 from pydantic import validate_call, conint
 
@@ -8,15 +8,22 @@ _WIDTH_VALIDATOR = conint(ge=1)
 _HEIGHT_VALIDATOR = conint(ge=1)
 
 
+@validate_call
+def _validate(
+    __width: _WIDTH_VALIDATOR, __height: _HEIGHT_VALIDATOR, /
+) -> Tuple[int, int]:
+    return __width, __height
+
+
 class Size2D(BaseRestorableModel):
     """
     Class representing a 2-dimensional size.
+
+    Sizes are immutable and hashable, and can be shared between threads.
     """
 
-    __width: int
-    __height: int
+    __slots__ = ("__width", "__height", "__weakref__")
 
-    @validate_call
     def __init__(
         self,
         __width: _WIDTH_VALIDATOR,
@@ -27,8 +34,29 @@ class Size2D(BaseRestorableModel):
         :param __width: The width of the size.
         :param __height: The height of the size.
         """
-        self.__width = __width  # get, set
-        self.__height = __height  # get, set
+        # positive integers are accepted as is, anything else is validated and coerced
+        if not (
+            type(__width) is int
+            and type(__height) is int
+            and __width >= 1
+            and __height >= 1
+        ):
+            __width, __height = _validate(__width, __height)
+        self.__width = __width  # get
+        self.__height = __height  # get
+
+    @classmethod
+    def _new(cls, __width: int, __height: int, /) -> Self:
+        """
+        Creates a size without validation, for values computed by the library.
+
+        :param __width: The width of the size, a positive integer.
+        :param __height: The height of the size, a positive integer.
+        """
+        size = object.__new__(cls)
+        size.__width = __width
+        size.__height = __height
+        return size
 
     @property
     def width(self) -> _WIDTH_VALIDATOR:
@@ -37,16 +65,6 @@ class Size2D(BaseRestorableModel):
         """
         return self.__width
 
-    @width.setter
-    @validate_call
-    def width(self, __width: _WIDTH_VALIDATOR, /):
-        """
-        Set the width of the size.
-
-        :param __width: The width of the size.
-        """
-        self.__width = __width
-
     @property
     def height(self) -> _HEIGHT_VALIDATOR:
         """
@@ -54,15 +72,13 @@ class Size2D(BaseRestorableModel):
         """
         return self.__height
 
-    @height.setter
-    @validate_call
-    def height(self, __height: _HEIGHT_VALIDATOR, /):
-        """
-        Set the height of the size.
+    def __eq__(self, __other: object, /) -> bool:
+        if not isinstance(__other, Size2D):
+            return NotImplemented
+        return self.__width == __other.__width and self.__height == __other.__height
 
-        :param __height: The height of the size.
-        """
-        self.__height = __height
+    def __hash__(self) -> int:
+        return hash((Size2D, self.__width, self.__height))
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.__width!r}, {self.__height!r})"
@@ -1,9 +1,18 @@
-from typing import Optional, Tuple, Sequence, Dict, Self, Type, Union
+from typing import (
+    Optional,
+    Tuple,
+    Sequence,
+    Dict,
+    Self,
+    Type,
+    Union,
+    TYPE_CHECKING,
+)
 from uuid import UUID
 
 from pydantic import validate_call, UUID4, ConfigDict, SkipValidation
 
-from . import BaseRestorableModel
+from . import BaseRestorableModel, _shared
 from .color import Color
 from .device import Device
 from .point2d import Point2D
@@ -11,12 +20,29 @@ from .size2d import Size2D
 from ..exceptions.duplicate_identifier import DuplicateIdentifier
 from ..readers import BaseReader, BaseAsyncReader  # noqa
 
+if TYPE_CHECKING:
+    from ..renderers import Renderer, RenderPlan
+
 
 class Template(BaseRestorableModel):
     """
     Class representing a template.
+
+    Templates are slotted, and share equal colors, points and sizes
+    with other templates, so large catalogs stay compact in memory.
     """
 
+    __slots__ = (
+        "__id",
+        "__color",
+        "__screenshot_start_point",
+        "__screenshot_size",
+        "__frame",
+        "__mask",
+        "__version",
+        "__device",
+    )
+
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
     def __init__(
         self,
@@ -39,11 +65,12 @@ class Template(BaseRestorableModel):
         :param device: Optional. Device object associated with the template.
         """
         self.__id = id  # get, set
-        self.__color = color  # get, set
-        self.__screenshot_start_point = screenshot_start_point  # get, set
-        self.__screenshot_size = screenshot_size  # get, set
+        self.__color = _shared(color)  # get, set
+        self.__screenshot_start_point = _shared(screenshot_start_point)  # get, set
+        self.__screenshot_size = _shared(screenshot_size)  # get, set
         self.__frame = frame  # get
         self.__mask = mask  # get
+        self.__version = 0  # get
 
         # init device
         self.__device = None
@@ -63,8 +90,32 @@ class Template(BaseRestorableModel):
         Set the unique identifier of the template.
 
         :param __id: The unique identifier of the template.
+        :raises DuplicateIdentifier: If the device of the template or its storage has another template with the same ID.
         """
+        if __id == self.__id:
+            return
+        storage = (
+            self.__device._Device__storage if self.__device is not None else None  # noqa
+        )
+        if self.__device is not None:
+            templates = self.__device._Device__templates  # noqa
+            if __id in templates or (
+                storage is not None and __id in storage._TemplateStorage__templates  # noqa
+            ):
+                raise DuplicateIdentifier(
+                    "Can't change template id because "
+                    f"template with id {__id!r} already exists"
+                )
+            # the index is rebuilt to keep the order of templates of the device
+            self.__device._Device__templates = {  # noqa
+                __id if template_id == self.__id else template_id: template
+                for template_id, template in templates.items()
+            }
+        if storage is not None:
+            storage._unindex_template(self)  # noqa
         self.__id = __id
+        if storage is not None:
+            storage._index_template(self)  # noqa
 
     @property
     def device(self) -> Optional[Device]:
@@ -80,19 +131,32 @@ class Template(BaseRestorableModel):
         Set the Device object associated with the template.
 
         :param __device: Device object associated with the template.
+        :raises DuplicateIdentifier: If the device or its storage has another template with the same ID.
         """
-        if __device == self.__device:
+        if __device is self.__device:
             return
-        if self.id in map(lambda device_template: device_template.id, __device):
+        storage = __device._Device__storage if __device is not None else None  # noqa
+        if __device is not None and (
+            self.__id in __device._Device__templates  # noqa
+            or (
+                storage is not None
+                and storage._TemplateStorage__templates.get(self.__id, self)  # noqa
+                is not self
+            )
+        ):
             raise DuplicateIdentifier(
                 "Can't assign template to device because "
-                f"template with id {self.id!r} already exists"
+                f"template with id {self.__id!r} already exists"
             )
-        if self.__device:
-            self.__device._Device__templates.remove(self)  # noqa
-        if __device:
-            __device._Device__templates.append(self)  # noqa
+        if self.__device is not None:
+            if (previous_storage := self.__device._Device__storage) is not None:  # noqa
+                previous_storage._unindex_template(self)  # noqa
+            del self.__device._Device__templates[self.__id]  # noqa
         self.__device = __device
+        if __device is not None:
+            __device._Device__templates[self.__id] = self  # noqa
+            if storage is not None:
+                storage._index_template(self)  # noqa
 
     @property
     def color(self) -> Color:
@@ -109,7 +173,14 @@ class Template(BaseRestorableModel):
 
         :param __color: The Color object associated with the template.
         """
-        self.__color = __color
+        storage = (
+            self.__device._Device__storage if self.__device is not None else None  # noqa
+        )
+        if storage is not None:
+            storage._unindex_template(self)  # noqa
+        self.__color = _shared(__color)
+        if storage is not None:
+            storage._index_template(self)  # noqa
 
     @property
     def screenshot_start_point(self) -> Point2D:
@@ -126,7 +197,8 @@ class Template(BaseRestorableModel):
 
         :param __screenshot_start_point: The Point2D object representing the starting point of a screenshot.
         """
-        self.__screenshot_start_point = __screenshot_start_point
+        self.__screenshot_start_point = _shared(__screenshot_start_point)
+        self.__version += 1
 
     @property
     def screenshot_size(self) -> Size2D:
@@ -143,7 +215,8 @@ class Template(BaseRestorableModel):
 
         :param __screenshot_size: The Size2D object representing the size of the screenshot.
         """
-        self.__screenshot_size = __screenshot_size
+        self.__screenshot_size = _shared(__screenshot_size)
+        self.__version += 1
 
     @property
     def frame(self) -> Union[BaseReader, BaseAsyncReader]:
@@ -159,6 +232,45 @@ class Template(BaseRestorableModel):
         """
         return self.__mask
 
+    @property
+    def version(self) -> int:
+        """
+        The revision of the template geometry.
+
+        Incremented whenever the screenshot start point or size changes,
+        so render plans built for a previous revision are not reused.
+        """
+        return self.__version
+
+    def compile(
+        self,
+        __renderer: Type["Renderer"],
+        /,
+        *,
+        portrait: bool = True,
+        disable_rotate: bool = False,
+        scale: Optional[float] = None,
+        max_size: Optional[Size2D] = None,
+    ) -> "RenderPlan":
+        """
+        Builds a render plan of the template for screenshots of the specified orientation.
+
+        :param __renderer: The renderer class to build the plan for.
+        :param portrait: Whether the screenshots are in portrait orientation.
+        :param disable_rotate: Whether the screenshots must not be rotated to fit the frame.
+        :param scale: Optional. The scale of the rendered image, from 0 to 1.
+        :param max_size: Optional. The size the rendered image is scaled down to fit in.
+
+        :return: A `RenderPlan` object, which can be reused across renders.
+        """
+        return __renderer.compile(
+            self,
+            portrait=portrait,
+            disable_rotate=disable_rotate,
+            scale=scale,
+            max_size=max_size,
+        )
+
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}("
@@ -19,6 +19,8 @@ class Reader(RestorableModel, Protocol):
     Protocol for reading and writing bytes from various sources.
     """
 
+    __slots__ = ()
+
     def __enter__(self) -> Self:
         """
         Enter the runtime context related to this object.
@@ -86,6 +88,8 @@ class AsyncReader(RestorableModel, Protocol):
     Protocol for asynchronous reading and writing bytes from various sources.
     """
 
+    __slots__ = ()
+
     async def __aenter__(self) -> Self:
         """
         Enter the asynchronous runtime context related to this object.
@@ -153,6 +157,8 @@ class BaseReader(Reader, BaseRestorableModel, ABC):
     Abstract base class for reading and writing bytes from various sources.
     """
 
+    __slots__ = ()
+
     def __enter__(self) -> Self:
         self.open()
         return self
@@ -180,6 +186,8 @@ class BaseAsyncReader(AsyncReader, BaseRestorableModel, ABC):
     Abstract base class for asynchronously reading and writing bytes from various sources.
     """
 
+    __slots__ = ()
+
     async def __aenter__(self) -> Self:
         await self.open()
         return self
@@ -1,37 +1,76 @@
 from abc import ABC
-from typing import Iterator, BinaryIO, Optional
+from threading import RLock
+from typing import Iterator, BinaryIO, Optional, Tuple
 
 from pydantic import validate_call, conint
 
 from .. import BaseReader
 
+# readers share a fixed set of locks instead of holding one each,
+# as their critical sections are short and catalogs hold many readers
+_LOCKS: Tuple[RLock, ...] = tuple(RLock() for _ in range(64))
+
 
 class BaseIOReader(BaseReader, ABC):
     """
     Abstract base class for IO readers.
 
+    Reads are positional, so concurrent reads of the same reader are independent
+    and never observe each other's position.
+
     :ivar _io: The underlying IO object.
     """
 
+    __slots__ = ("_io", "__weakref__")
+
     _io: Optional[BinaryIO]
 
+    def __init__(self, __io: Optional[BinaryIO] = None, /):
+        """
+        :param __io: Optional. The underlying IO object.
+        """
+        self._io = __io
+
+    @property
+    def _lock(self) -> RLock:
+        """
+        The lock guarding the underlying IO object, shared with a few other readers.
+        """
+        return _LOCKS[(id(self) >> 4) % len(_LOCKS)]
+
     @validate_call
     def iter_chunks(self, __chunk_size: conint(gt=0), /) -> Iterator[bytes]:
-        if not self._io:
-            raise IOError("IO is not open")
-        self._io.seek(0)
-        while True:
-            if chunk := self._io.read(__chunk_size):
-                yield chunk
-            else:
-                break
+        offset = 0
+        while chunk := self._read_at(offset, __chunk_size):
+            yield chunk
+            offset += len(chunk)
+
+    def read(self) -> bytes:
+        return self._read_at(0, None)
+
+    def _read_at(self, __offset: int, __size: Optional[int], /) -> bytes:
+        """
+        Reads bytes at the specified offset without affecting other reads.
+
+        :param __offset: The offset to read from.
+        :param __size: The maximum number of bytes to read, or None to read until the end.
+
+        :return: The read bytes, which are empty at the end.
+        """
+        with self._lock:
+            if not self._io:
+                raise IOError("IO is not open")
+            self._io.seek(__offset)
+            return self._io.read(-1 if __size is None else __size)
 
     def write(self, __data: bytes, /):
-        if not self._io:
-            raise IOError("IO is not open")
-        self._io.seek(0)
-        self._io.write(__data)
-        self._io.truncate()
+        with self._lock:
+            if not self._io:
+                raise IOError("IO is not open")
+            self._io.seek(0)
+            self._io.write(__data)
+            self._io.truncate()
+            self._io.flush()
 
 
 __all__ = ("BaseIOReader",)
@@ -12,16 +12,18 @@ class BytesIOReader(BaseIOReader):
     Reader for BytesIO objects.
     """
 
+    __slots__ = ()
+
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
     def __init__(self, __buffer: Optional[BytesIO] = None, /):
         """
         :param __buffer: The BytesIO object to read from.
         """
-        self._io = __buffer or BytesIO()
+        super().__init__(__buffer or BytesIO())
 
     def dump(self) -> Tuple[Sequence, Dict]:
-        self._io.seek(0)
-        return (b64encode(self._io.read()).decode(),), dict()
+        with self._lock:
+            return (b64encode(self._io.getvalue()).decode(),), dict()
 
     @classmethod
     @validate_call
@@ -1,5 +1,6 @@
+import os
 from pathlib import Path
-from typing import Tuple, Sequence, Dict
+from typing import Tuple, Sequence, Dict, Optional
 
 from pydantic import ConfigDict, validate_call
 
@@ -9,36 +10,66 @@ from . import BaseIOReader
 class FileReader(BaseIOReader):
     """
     Reader for files.
+
+    The reader can be opened several times, for example by concurrent renders
+    of the same template. The file is opened once and closed when the reader
+    is closed as many times as it was opened, and it is read with `os.pread`
+    where it is available, so concurrent reads don't wait for each other.
     """
 
+    __slots__ = ("__path", "__open_count")
+
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
     def __init__(self, __path: Path, /):
         """
         :param __path: The path to the file to read from.
         """
-        self.__path = __path
-        self._io = None
+        super().__init__()
+        # stored as a string, which is several times smaller than a path
+        self.__path = str(__path)
+        self.__open_count = 0
 
     def open(self):
-        if self._io:
-            raise IOError("File is already open")
-        self._io = self.__path.open("rb+")
+        with self._lock:
+            if self._io is None:
+                self._io = open(self.__path, "rb+")
+            self.__open_count += 1
 
     def close(self):
-        if not self._io:
-            raise IOError("File is not open")
-        self._io.close()
-        self._io = None
+        with self._lock:
+            if not self.__open_count:
+                raise IOError("File is not open")
+            self.__open_count -= 1
+            if not self.__open_count:
+                self._io.close()
+                self._io = None
+
+    def _read_at(self, __offset: int, __size: Optional[int], /) -> bytes:
+        if not hasattr(os, "pread"):
+            return super()._read_at(__offset, __size)
+        with self._lock:
+            if not self._io:
+                raise IOError("File is not open")
+            # the descriptor stays open while the caller holds the reader open
+            descriptor = self._io.fileno()
+        if __size is None:
+            __size = max(0, os.fstat(descriptor).st_size - __offset)
+        chunks = []
+        while __size > 0 and (chunk := os.pread(descriptor, __size, __offset)):
+            chunks.append(chunk)
+            __offset += len(chunk)
+            __size -= len(chunk)
+        return b"".join(chunks)
 
     @property
     def path(self) -> Path:
-        return self.__path
+        return Path(self.__path)
 
     def dump(self) -> Tuple[Sequence, Dict]:
-        return (self.__path,), dict()
+        return (self.path,), dict()
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}({self.__path!r})"
+        return f"{self.__class__.__name__}({self.path!r})"
 
 
 __all__ = ("FileReader",)
@@ -0,0 +1,270 @@
+from asyncio import wrap_future
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from multiprocessing.context import BaseContext
+from types import TracebackType
+from typing import Dict, Optional, Self, Sequence, Type
+from uuid import UUID
+
+from pydantic import validate_call, ConfigDict, UUID4, conint, confloat
+
+from .enums.encode_preset import EncodePreset
+from .enums.image_format import ImageFormat
+from .enums.resampling import Resampling
+from .exceptions.template_not_found import TemplateNotFound
+from .models.device import Device
+from .models.size2d import Size2D
+from .models.template import Template
+from .readers.io.bytesio import BytesIOReader
+from .renderers import BaseRenderer, FrameCache
+from .renderers.pillow import PilRenderer
+from .template_storage import TemplateStorage
+
+_worker_renderer: Optional[Type[BaseRenderer]] = None
+_worker_templates: Dict[UUID, Template] = dict()
+
+
+def _initialize_worker(
+    __renderer: Type[BaseRenderer],
+    __devices: Sequence[Device],
+    __preload: bool,
+    __frame_cache_bytes: Optional[int],
+    /,
+):
+    """
+    Initializes a worker process with a snapshot of the storage.
+
+    Plans are preloaded in the order of the snapshot until the next one
+    would not fit in the frame cache, so preloading never evicts a preloaded plan.
+
+    :param __renderer: The renderer class used by the worker.
+    :param __devices: The devices of the storage snapshot.
+    :param __preload: Whether plans of the templates are compiled upfront.
+    :param __frame_cache_bytes: The budget of the worker frame cache, or None to keep the renderer's.
+    """
+    global _worker_renderer
+    _worker_renderer = __renderer
+    _worker_templates.clear()
+    for device in __devices:
+        for template in device:
+            _worker_templates[template.id] = template
+    if __frame_cache_bytes is not None:
+        __renderer.frame_cache = FrameCache(__frame_cache_bytes)
+    frame_cache = __renderer.frame_cache
+    if not __preload or frame_cache is None:
+        return
+
+    for template in _worker_templates.values():
+        frame_size = __renderer._frame_size(template)  # noqa
+        preloaded = set()
+        for portrait in (True, False):
+            rotate = __renderer._rotates(  # noqa
+                template, frame_size, portrait=portrait, disable_rotate=False
+            )
+            if rotate in preloaded:
+                continue
+            # the frame and the base are "RGBA" images and the mask is an "L" image,
+            # as counted by `RenderPlan.nbytes`
+            nbytes = frame_size.width * frame_size.height * (9 if template.mask else 8)
+            if frame_cache.size + nbytes > frame_cache.max_bytes:
+                return
+            __renderer.compile(template, portrait=portrait)
+            preloaded.add(rotate)
+
+
+def _render_in_worker(
+    __template_id: UUID,
+    __screenshot: bytes,
+    /,
+    disable_rotate: bool,
+    constrain_proportions: bool,
+    format: ImageFormat,  # noqa
+    preset: EncodePreset,
+    resampling: Optional[Resampling],
+    scale: Optional[float],
+    max_size: Optional[Size2D],
+) -> bytes:
+    """
+    Renders a template of the worker snapshot.
+
+    :param __template_id: The ID of the template to render.
+    :param __screenshot: The encoded screenshot.
+    :param disable_rotate: Whether the screenshot must not be rotated to fit the frame.
+    :param constrain_proportions: Whether the screenshot proportions must be kept.
+    :param format: The format of the rendered image.
+    :param preset: The trade-off between encoding speed and output size.
+    :param resampling: The resampling filter, or None for the renderer default.
+    :param scale: The scale of the rendered image, or None for the full size.
+    :param max_size: The size the rendered image is scaled down to fit in, or None.
+
+    :return: The encoded rendered image.
+    """
+    return _worker_renderer.render_encoded(
+        _worker_templates[__template_id],
+        BytesIOReader(BytesIO(__screenshot)),
+        disable_rotate=disable_rotate,
+        constrain_proportions=constrain_proportions,
+        resampling=resampling,
+        scale=scale,
+        max_size=max_size,
+        format=format,
+        preset=preset,
+    )
+
+
+class RenderPool:
+    """
+    Pool of worker processes rendering templates of a storage snapshot.
+
+    Each worker holds its own copy of the devices and templates that were
+    in the storage when the pool was created, so jobs only carry template IDs
+    and screenshot bytes.
+    """
+
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def __init__(
+        self,
+        storage: Optional[TemplateStorage] = None,
+        *,
+        renderer: Type[BaseRenderer] = PilRenderer,
+        max_workers: Optional[conint(gt=0)] = None,
+        preload: bool = True,
+        frame_cache_bytes: Optional[conint(ge=0)] = None,
+        mp_context: Optional[BaseContext] = None,
+    ):
+        """
+        :param storage: Optional. The storage to snapshot. Defaults to the `TemplateStorage` singleton.
+        :param renderer: Optional. The renderer class used by the workers.
+        :param max_workers: Optional. The number of worker processes. Defaults to the number of CPUs.
+        :param preload: Optional. Whether the workers compile plans of the templates on start,
+                        as many as fit in their frame caches.
+        :param frame_cache_bytes: Optional. The budget of the frame cache of each worker in bytes.
+                                  Defaults to the budget of the renderer's frame cache.
+        :param mp_context: Optional. The multiprocessing context used to start the workers.
+        """
+        devices = tuple(storage if storage is not None else TemplateStorage())
+        self.__template_ids = frozenset(
+            template.id for device in devices for template in device
+        )
+        self.__executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_initialize_worker,
+            initargs=(renderer, devices, preload, frame_cache_bytes),
+        )
+
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def submit(
+        self,
+        __template_id: UUID4,
+        __screenshot: bytes,
+        /,
+        disable_rotate: bool = False,
+        constrain_proportions: bool = False,
+        format: ImageFormat = ImageFormat.PNG,  # noqa
+        preset: EncodePreset = EncodePreset.BALANCED,
+        resampling: Optional[Resampling] = None,
+        scale: Optional[confloat(gt=0, le=1)] = None,
+        max_size: Optional[Size2D] = None,
+    ) -> Future:
+        """
+        Submits a render job to the pool.
+
+        :param __template_id: The ID of the template to render.
+        :param __screenshot: The encoded screenshot.
+        :param disable_rotate: Whether the screenshot must not be rotated to fit the frame.
+        :param constrain_proportions: Whether the screenshot proportions must be kept.
+        :param format: Optional. The format of the rendered image.
+        :param preset: Optional. The trade-off between encoding speed and output size.
+        :param resampling: Optional. The resampling filter. Defaults to the `resampling` of the renderer class.
+        :param scale: Optional. The scale of the rendered image, from 0 to 1.
+        :param max_size: Optional. The size the rendered image is scaled down to fit in.
+
+        :return: A future resolving to the encoded rendered image.
+        :raises TemplateNotFound: If the template is not in the storage snapshot.
+        """
+        if __template_id not in self.__template_ids:
+            raise TemplateNotFound(f"Template with id {__template_id!r} is not found")
+        return self.__executor.submit(
+            _render_in_worker,
+            __template_id,
+            __screenshot,
+            disable_rotate=disable_rotate,
+            constrain_proportions=constrain_proportions,
+            format=format,
+            preset=preset,
+            resampling=resampling,
+            scale=scale,
+            max_size=max_size,
+        )
+
+    async def submit_async(
+        self,
+        __template_id: UUID4,
+        __screenshot: bytes,
+        /,
+        disable_rotate: bool = False,
+        constrain_proportions: bool = False,
+        format: ImageFormat = ImageFormat.PNG,  # noqa
+        preset: EncodePreset = EncodePreset.BALANCED,
+        resampling: Optional[Resampling] = None,
+        scale: Optional[confloat(gt=0, le=1)] = None,
+        max_size: Optional[Size2D] = None,
+    ) -> bytes:
+        """
+        Submits a render job to the pool and waits for it without blocking the event loop.
+
+        :param __template_id: The ID of the template to render.
+        :param __screenshot: The encoded screenshot.
+        :param disable_rotate: Whether the screenshot must not be rotated to fit the frame.
+        :param constrain_proportions: Whether the screenshot proportions must be kept.
+        :param format: Optional. The format of the rendered image.
+        :param preset: Optional. The trade-off between encoding speed and output size.
+        :param resampling: Optional. The resampling filter. Defaults to the `resampling` of the renderer class.
+        :param scale: Optional. The scale of the rendered image, from 0 to 1.
+        :param max_size: Optional. The size the rendered image is scaled down to fit in.
+
+        :return: The encoded rendered image.
+        :raises TemplateNotFound: If the template is not in the storage snapshot.
+        """
+        return await wrap_future(
+            self.submit(
+                __template_id,
+                __screenshot,
+                disable_rotate=disable_rotate,
+                constrain_proportions=constrain_proportions,
+                format=format,
+                preset=preset,
+                resampling=resampling,
+                scale=scale,
+                max_size=max_size,
+            )
+        )
+
+    @validate_call
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        """
+        Shuts the pool down. Jobs that are already submitted are completed
+        unless they are cancelled.
+
+        :param wait: Optional. Whether to wait for the running jobs and the workers to exit.
+        :param cancel_futures: Optional. Whether to cancel jobs that have not started yet.
+        """
+        self.__executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ):
+        self.shutdown()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(templates={len(self.__template_ids)!r})"
+
+
+__all__ = ("RenderPool",)
@@ -1,14 +1,48 @@
+import hashlib
+import math
+import os
 from abc import abstractmethod, ABC
+from asyncio import get_running_loop, run_coroutine_threadsafe
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import suppress
 from pathlib import Path
-from typing import Protocol, Self, Union, Optional
+from threading import Lock
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Protocol,
+    Self,
+    Union,
+    Optional,
+    ClassVar,
+    Iterable,
+    Generator,
+    Dict,
+    Tuple,
+    BinaryIO,
+)
+from weakref import WeakKeyDictionary
 
-from pydantic import ConfigDict, validate_call, SkipValidation
+from pydantic import ConfigDict, validate_call, SkipValidation, confloat, conint
 
+from .disk_frame_cache import DiskFrameCache
+from .frame_cache import FrameCache
+from .render_observer import RenderEvent, RenderObserver, RenderReport
+from .render_plan import RenderPlan
+from .result_cache import RenderResultCache
 from .. import FileReader
+from ..enums.encode_preset import EncodePreset
+from ..enums.image_format import ImageFormat
+from ..enums.render_stage import RenderStage
+from ..enums.resampling import Resampling
 from ..models.point2d import Point2D
 from ..models.size2d import Size2D
 from ..models.template import Template
-from ..readers import Reader, BaseReader
+from ..readers import Reader, AsyncReader, BaseReader, BaseAsyncReader
+
+# frame sizes are cached next to the plans, counted at a nominal size
+_FRAME_SIZE_NBYTES = 64
 
 
 class Renderer(Protocol):
@@ -23,11 +57,12 @@ class Renderer(Protocol):
         :param __size: The size of the renderers as a `Size2D` object.
         """
 
-    def resize(self, __size: Size2D, /):
+    def resize(self, __size: Size2D, /, resampling: Optional[Resampling] = None):
         """
         Resizes the image to the specified size.
 
         :param __size: The new size of the renderers.
+        :param resampling: Optional. The resampling filter. Defaults to the `resampling` of the renderer class.
         """
 
     def rotate(self, __angle: float, /):
@@ -60,16 +95,48 @@ class Renderer(Protocol):
         :param __image: The image to put the alpha channel from.
         """
 
+    def convert(self, __mode: str, /):
+        """
+        Converts the pixels of the image to the specified mode.
+
+        :param __mode: The new pixel layout, such as "RGBA", "RGB" or "L".
+        """
+
     @classmethod
-    def from_bytes(cls, __data: bytes, /) -> Self:
+    def from_bytes(
+        cls,
+        __data: bytes,
+        /,
+        *,
+        size_hint: Optional[Size2D] = None,
+        max_pixels: Optional[int] = None,
+    ) -> Self:
         """
         Creates a new image from the specified byte data.
 
         :param __data: The byte data representing the image.
+        :param size_hint: Optional. The smallest size the image will be used at.
+                          If provided, the image may be decoded at a reduced scale,
+                          but not below this size in either dimension.
+        :param max_pixels: Optional. The maximum number of pixels the image is decoded at.
+                           The size is checked from the image header before decoding,
+                           after the decoder has selected a reduced scale for the size hint
+                           where it supports one.
+        :raises PixelBudgetExceeded: If the image is larger than `max_pixels`.
 
         :return: A new `Renderer` object.
         """
 
+    @classmethod
+    def probe_size(cls, __data: bytes, /) -> Size2D:
+        """
+        Reads the size of the image from the specified byte data without decoding pixels, if possible.
+
+        :param __data: The byte data representing the image.
+
+        :return: The size of the image as a `Size2D` object.
+        """
+
     def to_bytes(self) -> bytes:
         """
         Converts the image to byte data in PNG format.
@@ -77,6 +144,31 @@ class Renderer(Protocol):
         :return: The byte data representing the image in PNG format.
         """
 
+    def encode(
+        self,
+        __destination: Optional[Union[Path, BinaryIO, Reader]] = None,
+        /,
+        *,
+        format: ImageFormat = ImageFormat.PNG,  # noqa
+        preset: EncodePreset = EncodePreset.BALANCED,
+        quality: Optional[int] = None,
+        compress_level: Optional[int] = None,
+    ) -> Optional[bytes]:
+        """
+        Encodes the image and writes it directly to the destination.
+
+        :param __destination: Optional. A file path, a writable binary stream or a `Reader`
+                              to write the image to. If not provided, the encoded bytes are returned.
+        :param format: Optional. The format of the encoded image.
+                       The alpha channel is flattened onto white for formats without alpha.
+        :param preset: Optional. The trade-off between encoding speed and output size.
+        :param quality: Optional. The quality of lossy formats from 1 to 100.
+        :param compress_level: Optional. The PNG compression level from 0 to 9,
+                               overriding the one selected by the preset.
+
+        :return: The encoded bytes if no destination is provided, otherwise None.
+        """
+
     @classmethod
     def from_reader(cls, __reader: Reader, /) -> Self:
         """
@@ -94,6 +186,44 @@ class Renderer(Protocol):
         The size of the image as a `Size2D` object.
         """
 
+    @property
+    @abstractmethod
+    def mode(self) -> str:
+        """
+        The pixel layout of the raw buffer, such as "RGBA", "RGB" or "L".
+        """
+
+    def to_buffer(self) -> memoryview:
+        """
+        Exports raw pixels of the image.
+
+        Pixels are stored row by row without padding, in the layout described by `mode`.
+        The returned view may share memory with the image and must not be modified.
+
+        :return: A `memoryview` of the raw pixels.
+        """
+
+    @classmethod
+    def from_buffer(
+        cls,
+        __size: Size2D,
+        __buffer: memoryview,
+        /,
+        mode: str = "RGBA",
+    ) -> Self:
+        """
+        Creates a new image from raw pixels.
+
+        The image may share memory with the buffer instead of copying it,
+        so the buffer must not be modified while the image is alive.
+
+        :param __size: The size of the image.
+        :param __buffer: The raw pixels, stored row by row without padding.
+        :param mode: Optional. The pixel layout of the buffer.
+
+        :return: A new `Renderer` object.
+        """
+
     def copy(self) -> Self:
         """
         Creates a deep copy of the image.
@@ -101,102 +231,1451 @@ class Renderer(Protocol):
         :return: A new `Renderer` object that is a copy of the current image.
         """
 
+    def crop(self, __start_point: Point2D, __size: Size2D, /) -> Self:
+        """
+        Copies a region of the image.
+
+        :param __start_point: The starting point of the region.
+        :param __size: The size of the region.
+
+        :return: A new `Renderer` object containing the region, clipped to the image bounds.
+        """
+
+    @classmethod
+    def compile(
+        cls,
+        __template: Template,
+        /,
+        *,
+        portrait: bool = True,
+        disable_rotate: bool = False,
+        scale: Optional[float] = None,
+        max_size: Optional[Size2D] = None,
+    ) -> RenderPlan:
+        """
+        Builds a render plan of the template for screenshots of the specified orientation.
+
+        :param __template: The template to be compiled.
+        :param portrait: Whether the screenshots are in portrait orientation.
+        :param disable_rotate: Whether the screenshots must not be rotated to fit the frame.
+        :param scale: Optional. The scale of the rendered image, from 0 to 1.
+        :param max_size: Optional. The size the rendered image is scaled down to fit in.
+
+        :return: A `RenderPlan` object, which can be reused across renders.
+        """
+
+    @classmethod
+    def estimate_memory(
+        cls,
+        __template: Template,
+        __screenshot_size: Size2D,
+        /,
+        disable_rotate: bool = False,
+        constrain_proportions: bool = False,
+        scale: Optional[float] = None,
+        max_size: Optional[Size2D] = None,
+    ) -> int:
+        """
+        Estimates the peak memory allocated by a render of the template.
+
+        :param __template: The template to be rendered.
+        :param __screenshot_size: The size of the screenshot, as returned by `probe_size`.
+        :param disable_rotate: Whether the screenshot must not be rotated to fit the frame.
+        :param constrain_proportions: Whether the screenshot proportions must be kept.
+        :param scale: Optional. The scale of the rendered image, from 0 to 1.
+        :param max_size: Optional. The size the rendered image is scaled down to fit in.
+
+        :return: The estimated peak memory in bytes.
+        """
+
     @classmethod
     def render(
-        cls, __template: Template, __screenshot: Union["Renderer", Reader, Path], /
+        cls,
+        __template: Template,
+        __screenshot: Union["Renderer", Reader, Path],
+        /,
+        *,
+        observer: Optional[RenderObserver] = None,
+        report: bool = False,
     ):
         """
         Renders the specified template from a screenshot.
 
         :param __template: The template to be rendered.
         :param __screenshot: The screenshot to render the template from, either as an `Renderer` object or a `Reader`.
+        :param observer: Optional. The observer notified of each stage of the render,
+                         in addition to the `observer` of the renderer class.
+        :param report: Optional. Whether to collect the stages into a `RenderReport`
+                       attached to the rendered image as `report`.
 
         :return: A new `Renderer` object containing the rendered template.
         """
 
+    @classmethod
+    def render_encoded(
+        cls,
+        __template: Template,
+        __screenshot: Union["Renderer", Reader, Path],
+        /,
+        *,
+        format: ImageFormat = ImageFormat.PNG,  # noqa
+        preset: EncodePreset = EncodePreset.BALANCED,
+        quality: Optional[int] = None,
+        compress_level: Optional[int] = None,
+        observer: Optional[RenderObserver] = None,
+    ) -> bytes:
+        """
+        Renders the specified template from a screenshot and encodes the result.
+
+        Results are served from and stored in the `result_cache` of the renderer class, if it is set.
+
+        :param __template: The template to be rendered.
+        :param __screenshot: The screenshot to render the template from, either as an `Renderer` object or a `Reader`.
+        :param format: Optional. The format of the rendered image.
+        :param preset: Optional. The trade-off between encoding speed and output size.
+        :param quality: Optional. The quality of lossy formats, from 1 to 100.
+        :param compress_level: Optional. The PNG compression level, from 0 to 9.
+        :param observer: Optional. The observer notified of each stage of the render,
+                         in addition to the `observer` of the renderer class.
+
+        :return: The encoded rendered image.
+        """
+
+    @classmethod
+    async def render_async(
+        cls,
+        __template: Template,
+        __screenshot: Union["Renderer", Reader, AsyncReader, Path],
+        /,
+        *,
+        executor: Optional[Executor] = None,
+        observer: Optional[RenderObserver] = None,
+        report: bool = False,
+    ) -> "Renderer":
+        """
+        Asynchronously renders the specified template from a screenshot.
+
+        Frames, masks and screenshots are fetched concurrently, and CPU-bound stages
+        run in an executor, so the event loop is never blocked.
+
+        :param __template: The template to be rendered.
+        :param __screenshot: The screenshot to render the template from, either as an `Renderer` object, a `Reader` or an `AsyncReader`.
+        :param executor: Optional. The executor to run CPU-bound stages in.
+                         Defaults to a shared thread pool with bounded concurrency.
+        :param observer: Optional. The observer notified of each stage of the render,
+                         in addition to the `observer` of the renderer class.
+        :param report: Optional. Whether to collect the stages into a `RenderReport`
+                       attached to the rendered image as `report`.
+
+        :return: A new `Renderer` object containing the rendered template.
+        """
+
+    @classmethod
+    def render_many(
+        cls,
+        __templates: Iterable[Template],
+        __screenshot: Union["Renderer", Reader, Path],
+        /,
+        *,
+        observer: Optional[RenderObserver] = None,
+        report: bool = False,
+    ) -> Generator["Renderer", None, None]:
+        """
+        Renders the specified templates from a single screenshot.
+
+        The screenshot is decoded once, and the resized screenshot
+        is shared between templates with the same screenshot size.
+
+        :param __templates: The templates to be rendered.
+        :param __screenshot: The screenshot to render the templates from, either as an `Renderer` object or a `Reader`.
+        :param observer: Optional. The observer notified of each stage of the renders,
+                         in addition to the `observer` of the renderer class.
+        :param report: Optional. Whether to collect the stages into a single `RenderReport`
+                       attached to every rendered image as `report`. The report grows
+                       as the generator advances.
+
+        :return: A generator of new `Renderer` objects containing the rendered templates, in order.
+        """
+
 
 class BaseRenderer(Renderer, ABC):
+    """
+    Abstract base class for renderers.
+
+    :cvar frame_cache: Optional. The cache of render plans and probed frame sizes of templates.
+    :cvar disk_frame_cache: Optional. The persistent cache of decoded template frames and masks
+                            read from files, consulted before decoding.
+    :cvar render_concurrency: The maximum number of CPU-bound stages of asynchronous
+                              renders running at once in the default executor.
+                              Renderers with the same concurrency share the executor.
+    :cvar resampling: The resampling filter used when a render call does not specify one.
+    :cvar result_cache: Optional. The cache of encoded results of `render_encoded`.
+    :cvar observer: Optional. The observer notified of each stage of every render.
+    :cvar max_decode_pixels: Optional. The maximum number of pixels a screenshot is decoded at,
+                             passed to `from_bytes` as `max_pixels`. Frames and masks
+                             of templates are not limited. Larger screenshots raise
+                             `PixelBudgetExceeded`.
+    :ivar report: The `RenderReport` of the render that produced the image,
+                  if it was requested, otherwise None.
+    """
+
+    frame_cache: ClassVar[Optional[FrameCache]] = None
+    disk_frame_cache: ClassVar[Optional[DiskFrameCache]] = None
+    result_cache: ClassVar[Optional[RenderResultCache]] = None
+    render_concurrency: ClassVar[int] = os.cpu_count() or 1
+    resampling: ClassVar[Resampling] = Resampling.BICUBIC
+    observer: ClassVar[Optional[RenderObserver]] = None
+    max_decode_pixels: ClassVar[Optional[int]] = None
+
+    report: Optional[RenderReport] = None
+
+    # default executors by the number of workers, shared by all renderers
+    __executors: ClassVar[Dict[int, Executor]] = dict()
+    __executor_lock: ClassVar[Lock] = Lock()
+    # digests of frames and masks not read from files, by their readers
+    __reader_digests: ClassVar["WeakKeyDictionary[BaseReader, str]"] = (
+        WeakKeyDictionary()
+    )
+
     def copy(self) -> Self:
-        return self.__class__.from_bytes(self.to_bytes())
+        return self.__class__.from_buffer(
+            self.size, memoryview(bytes(self.to_buffer())), self.mode
+        )
+
+    def to_bytes(self) -> bytes:
+        return self.encode()
 
     @classmethod
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
     def from_reader(cls, __reader: BaseReader, /) -> SkipValidation[Self]:  # noqa
         return cls.from_bytes(__reader.read())
 
+    @classmethod
+    @validate_call
+    def probe_size(cls, __data: bytes, /) -> Size2D:
+        return cls.from_bytes(__data).size
+
+    @classmethod
+    def _get_executor(cls) -> Executor:
+        """
+        Returns the executor running CPU-bound stages of asynchronous renders.
+
+        The executor is created on first use with `render_concurrency` workers
+        of the renderer class, and it is shared with the renderers
+        of the same concurrency.
+        """
+        with cls.__executor_lock:
+            if (executor := cls.__executors.get(cls.render_concurrency)) is None:
+                executor = cls.__executors[cls.render_concurrency] = ThreadPoolExecutor(
+                    max_workers=cls.render_concurrency,
+                    thread_name_prefix="mockup_engineer_render",
+                )
+            return executor
+
+    @staticmethod
+    def _alpha_plane(__mask: "Renderer", /) -> "Renderer":
+        """
+        Returns the mask as a new single-band "L" image, ready to be put as the alpha channel.
+        """
+        alpha = __mask.copy()
+        if alpha.mode != "L":
+            alpha.convert("L")
+        return alpha
+
+    @classmethod
+    def _observers(
+        cls, *__observers: Optional[RenderObserver]
+    ) -> Tuple[RenderObserver, ...]:
+        """
+        Returns the observers of a render, starting with the `observer` of the renderer class.
+        """
+        return tuple(
+            observer
+            for observer in (cls.observer,) + __observers
+            if observer is not None
+        )
+
+    @staticmethod
+    def _emit(
+        __observers: Tuple[RenderObserver, ...],
+        __stage: RenderStage,
+        __started_at: float,
+        /,
+        *,
+        template: Optional[Template] = None,
+        result: Optional[Union["Renderer", RenderPlan]] = None,
+        nbytes: Optional[int] = None,
+        cache_hit: Optional[bool] = None,
+    ):
+        """
+        Notifies the observers that a stage has finished.
+
+        Nothing is computed if there are no observers, so stages can be instrumented
+        unconditionally.
+
+        :param __observers: The observers of the render.
+        :param __stage: The finished stage.
+        :param __started_at: The value of `time.perf_counter` when the stage has started.
+        :param template: Optional. The template the stage belongs to.
+        :param result: Optional. The image or the render plan produced by the stage.
+        :param nbytes: Optional. The number of encoded bytes read or written by the stage.
+        :param cache_hit: Optional. Whether the stage was served from a cache.
+        """
+        if not __observers:
+            return
+        event = RenderEvent(
+            stage=__stage,
+            duration=perf_counter() - __started_at,
+            template_id=template.id if template is not None else None,
+            size=result.size if result is not None else None,
+            nbytes=nbytes,
+            cache_hit=cache_hit,
+        )
+        for observer in __observers:
+            observer.on_event(event)
+
+    @staticmethod
+    def _read_template_image(__reader: BaseReader, /) -> bytes:
+        """
+        Reads the encoded frame or mask of a template.
+        """
+        with __reader as reader:
+            return reader.read()
+
+    @classmethod
+    def _load_template_image(
+        cls,
+        __template: Template,
+        __reader: Union[BaseReader, BaseAsyncReader],
+        /,
+        observers: Tuple[RenderObserver, ...] = (),
+        read: Optional[Callable[[Any], bytes]] = None,
+    ) -> Self:
+        """
+        Decodes a frame or a mask of the template, using the disk frame cache if it is set.
+
+        Decoded images are only held by the render plans built from them,
+        so they are not cached in memory.
+
+        :param __template: The template the image belongs to.
+        :param __reader: The reader of the image.
+        :param observers: Optional. The observers notified of the `LOAD` stage.
+        :param read: Optional. Reads the encoded image. Defaults to `_read_template_image`.
+
+        :return: A new image.
+        """
+        started_at = perf_counter()
+        disk_frame_cache = cls.disk_frame_cache
+        if disk_frame_cache is not None and isinstance(__reader, FileReader):
+            if (entry := disk_frame_cache.get(__reader.path)) is not None:
+                size, mode, buffer = entry
+                image = cls.from_buffer(size, buffer, mode)
+                cls._emit(
+                    observers,
+                    RenderStage.LOAD,
+                    started_at,
+                    template=__template,
+                    result=image,
+                    nbytes=buffer.nbytes,
+                    cache_hit=True,
+                )
+                return image
+
+        data = (read or cls._read_template_image)(__reader)
+        image = cls.from_bytes(data)
+        if disk_frame_cache is not None and isinstance(__reader, FileReader):
+            disk_frame_cache.put(
+                __reader.path, image.size, image.mode, image.to_buffer()
+            )
+        cls._emit(
+            observers,
+            RenderStage.LOAD,
+            started_at,
+            template=__template,
+            result=image,
+            nbytes=len(data),
+            cache_hit=False,
+        )
+        return image
+
+    @classmethod
+    def _frame_size(
+        cls,
+        __template: Template,
+        /,
+        read: Optional[Callable[[Any], bytes]] = None,
+    ) -> Size2D:
+        """
+        Returns the size of the template frame, probed without decoding it
+        and cached next to the plans.
+
+        :param __template: The template the frame belongs to.
+        :param read: Optional. Reads the encoded frame. Defaults to `_read_template_image`.
+
+        :return: The size of the frame.
+        """
+
+        def probe():
+            data = (read or cls._read_template_image)(__template.frame)
+            return cls.probe_size(data), _FRAME_SIZE_NBYTES
+
+        if cls.frame_cache is None:
+            return probe()[0]
+        return cls.frame_cache.get_or_create(
+            (cls, Size2D, __template.id, __template.frame), probe
+        )
+
     @classmethod
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
-    def render(  # noqa
+    def compile(  # noqa
         cls,
         __template: Template,
-        __screenshot: Union[SkipValidation["Renderer"], BaseReader, Path],
+        /,
+        *,
+        portrait: bool = True,
+        disable_rotate: bool = False,
+        scale: Optional[confloat(gt=0, le=1)] = None,
+        max_size: Optional[Size2D] = None,
+    ) -> RenderPlan:
+        return cls._compile(
+            __template,
+            portrait=portrait,
+            disable_rotate=disable_rotate,
+            scale=scale,
+            max_size=max_size,
+            observers=cls._observers(),
+        )
+
+    @classmethod
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def estimate_memory(  # noqa
+        cls,
+        __template: Template,
+        __screenshot_size: Size2D,
         /,
         disable_rotate: bool = False,
         constrain_proportions: bool = False,
-    ):
+        scale: Optional[confloat(gt=0, le=1)] = None,
+        max_size: Optional[Size2D] = None,
+    ) -> int:
+        """
+        Estimates the peak memory allocated by a render of the template.
+
+        The template is not compiled: the geometry of its plan is computed from
+        the probed frame size, so no frame is decoded. Plans are shared
+        between renders and are not counted. The canvases of each stage are counted
+        as "RGBA" images, and the screenshot is assumed to be decoded at full size
+        before its integer reduction, so the estimate is an upper bound.
+
+        :param __template: The template to be rendered.
+        :param __screenshot_size: The size of the screenshot, as returned by `probe_size`.
+        :param disable_rotate: Whether the screenshot must not be rotated to fit the frame.
+        :param constrain_proportions: Whether the screenshot proportions must be kept.
+        :param scale: Optional. The scale of the rendered image, from 0 to 1.
+        :param max_size: Optional. The size the rendered image is scaled down to fit in.
+
+        :return: The estimated peak memory in bytes.
+        """
+        frame_size = cls._frame_size(__template)
+        rotate = cls._rotates(
+            __template,
+            frame_size,
+            portrait=__screenshot_size.width <= __screenshot_size.height,
+            disable_rotate=disable_rotate,
+        )
+        plan_size, start_point, size_hint = cls._plan_geometry(
+            __template, frame_size, rotate
+        )
+        if (plan_scale := cls._plan_scale(plan_size, scale, max_size)) != 1:
+            plan_size, _, size_hint = cls._scale_geometry(
+                plan_size, start_point, size_hint, plan_scale
+            )
+        factor = min(
+            __screenshot_size.width // size_hint.width,
+            __screenshot_size.height // size_hint.height,
+        )
+        if factor >= 2:
+            reduced_size = Size2D._new(
+                -(-__screenshot_size.width // factor),
+                -(-__screenshot_size.height // factor),
+            )
+        else:
+            reduced_size = __screenshot_size
+        prepared_size = cls._prepared_size(
+            reduced_size, size_hint, constrain_proportions
+        )
+
+        def nbytes(size: Size2D) -> int:
+            return size.width * size.height * 4
+
+        return max(
+            # the decoded screenshot and its reduced copy
+            nbytes(__screenshot_size)
+            + (nbytes(reduced_size) if factor >= 2 else 0),
+            # resampling allocates the resized image and a premultiplied copy of the source
+            2 * nbytes(reduced_size) + nbytes(prepared_size),
+            # the copy of the base, the resized screenshot, its copy converted
+            # to the mode of the base and the frame crop blended over it
+            nbytes(plan_size) + 3 * nbytes(prepared_size),
+        )
+
+    @classmethod
+    def _compile(
+        cls,
+        __template: Template,
+        /,
+        *,
+        portrait: bool,
+        disable_rotate: bool,
+        scale: Optional[float] = None,
+        max_size: Optional[Size2D] = None,
+        observers: Tuple[RenderObserver, ...] = (),
+        read: Optional[Callable[[Any], bytes]] = None,
+    ) -> RenderPlan:
+        """
+        Builds a render plan of the template.
+
+        The orientation of the plan is chosen from the probed frame size, so the frame
+        and the mask are only decoded when the plan is not cached.
+        Scaled plans are resampled from the nearest level of a pyramid of plans
+        halved from the full-size plan. Levels are built lazily, and all plans are cached.
+
+        :param __template: The template to be compiled.
+        :param portrait: Whether the screenshots are in portrait orientation.
+        :param disable_rotate: Whether the screenshots must not be rotated to fit the frame.
+        :param scale: Optional. The scale of the rendered image, from 0 to 1.
+        :param max_size: Optional. The size the rendered image is scaled down to fit in.
+        :param observers: Optional. The observers notified of the `COMPILE` stage,
+                          which is a cache hit if no plan has been built,
+                          and of the `LOAD` stages.
+        :param read: Optional. Reads the encoded frame and mask. Defaults to `_read_template_image`.
+
+        :return: A `RenderPlan` object, which can be reused across renders.
+        """
         assert __template.device is not None
 
+        started_at = perf_counter()
+        cache_hit = True
+        frame_size = cls._frame_size(__template, read)
+        rotate = cls._rotates(
+            __template, frame_size, portrait=portrait, disable_rotate=disable_rotate
+        )
+
+        def build():
+            nonlocal cache_hit
+            cache_hit = False
+            decoded_frame = cls._load_template_image(
+                __template, __template.frame, observers, read
+            )
+            # the frame is put at the default start point of `put_image`,
+            # so it is shifted once onto a transparent image aligned with the composite
+            frame = cls(decoded_frame.size)
+            frame.put_image(decoded_frame)
+            del decoded_frame
+            # the mask replaces the alpha of the whole composite,
+            # so it is converted only once into the final alpha plane
+            mask = (
+                cls._alpha_plane(
+                    cls._load_template_image(
+                        __template, __template.mask, observers, read
+                    )
+                )
+                if __template.mask
+                else None
+            )
+            if rotate:
+                frame.rotate(90)
+                if mask is not None:
+                    mask.rotate(90)
+            _, screenshot_start_point, screenshot_size = cls._plan_geometry(
+                __template, frame_size, rotate
+            )
+            plan = cls._make_plan(
+                frame,
+                mask,
+                screenshot_start_point=screenshot_start_point,
+                screenshot_size=screenshot_size,
+                rotate=rotate,
+            )
+            return plan, plan.nbytes
+
+        key = (
+            cls,
+            RenderPlan,
+            __template.id,
+            __template.frame,
+            __template.mask,
+            __template.version,
+            rotate,
+        )
+        if cls.frame_cache is None:
+            plan = build()[0]
+        else:
+            plan = cls.frame_cache.get_or_create(key, build)
+
+        plan_scale = cls._plan_scale(plan.size, scale, max_size)
+
+        def get_scaled(level: RenderPlan, target_scale: float) -> RenderPlan:
+            def build_scaled():
+                nonlocal cache_hit
+                cache_hit = False
+                scaled_plan = cls._scale_plan(plan, target_scale, level)
+                return scaled_plan, scaled_plan.nbytes
+
+            if cls.frame_cache is None:
+                return build_scaled()[0]
+            return cls.frame_cache.get_or_create(key + (target_scale,), build_scaled)
+
+        if plan_scale != 1:
+            level, level_scale = plan, 1.0
+            while level_scale / 2 >= plan_scale:
+                level_scale /= 2
+                level = get_scaled(level, level_scale)
+            if level_scale != plan_scale:
+                level = get_scaled(level, plan_scale)
+            plan = level
+
+        cls._emit(
+            observers,
+            RenderStage.COMPILE,
+            started_at,
+            template=__template,
+            result=plan,
+            cache_hit=cache_hit,
+        )
+        return plan
+
+    @staticmethod
+    def _rotates(
+        __template: Template,
+        __frame_size: Size2D,
+        /,
+        *,
+        portrait: bool,
+        disable_rotate: bool,
+    ) -> bool:
+        """
+        Returns whether the plan of the template is rotated to fit screenshots
+        of the orientation.
+
+        :param __template: The template to be compiled.
+        :param __frame_size: The size of the template frame, as returned by `_frame_size`.
+        :param portrait: Whether the screenshots are in portrait orientation.
+        :param disable_rotate: Whether the screenshots must not be rotated to fit the frame.
+        """
+        return (
+            not disable_rotate
+            and portrait != (__frame_size.width <= __frame_size.height)
+            and __template.device.can_rotate
+        )
+
+    @staticmethod
+    def _plan_geometry(
+        __template: Template, __frame_size: Size2D, __rotate: bool, /
+    ) -> Tuple[Size2D, Point2D, Size2D]:
+        """
+        Returns the geometry of the full-size plan of the template, computed
+        without decoding its frame.
+
+        :param __template: The template to be compiled.
+        :param __frame_size: The size of the template frame, as returned by `_frame_size`.
+        :param __rotate: Whether the frame is rotated to fit the screenshot.
+
+        :return: The size of the rendered image, the starting point
+                 and the size of the screenshot on it.
+        """
+        if not __rotate:
+            return (
+                __frame_size,
+                __template.screenshot_start_point,
+                __template.screenshot_size,
+            )
+        return (
+            Size2D(__frame_size.height, __frame_size.width),
+            Point2D(
+                __template.screenshot_start_point.y,
+                __frame_size.width
+                - __template.screenshot_start_point.x
+                - __template.screenshot_size.width,
+            ),
+            Size2D(
+                __template.screenshot_size.height,
+                __template.screenshot_size.width,
+            ),
+        )
+
+    @classmethod
+    def _make_plan(
+        cls,
+        __frame: "Renderer",
+        __mask: Optional["Renderer"],
+        /,
+        *,
+        screenshot_start_point: Point2D,
+        screenshot_size: Size2D,
+        rotate: bool,
+    ) -> RenderPlan:
+        """
+        Creates a render plan from the frame aligned with the rendered image.
+
+        :param __frame: The frame aligned with the rendered image.
+        :param __mask: Optional. The alpha plane of the rendered image.
+        :param screenshot_start_point: The starting point of the screenshot on the rendered image.
+        :param screenshot_size: The size of the screenshot on the rendered image.
+        :param rotate: Whether the frame is rotated to fit the screenshot.
+
+        :return: A new `RenderPlan` object.
+        """
+        base = cls(__frame.size)
+        base.put_image(__frame, Point2D(0, 0), mask=__frame)
+        if __mask is not None:
+            base.put_alpha(__mask)
+        return RenderPlan(
+            frame=__frame,
+            base=base,
+            mask=__mask,
+            screenshot_start_point=screenshot_start_point,
+            screenshot_size=screenshot_size,
+            size=__frame.size,
+            rotate=rotate,
+        )
+
+    @staticmethod
+    def _plan_scale(
+        __size: Size2D,
+        __scale: Optional[float],
+        __max_size: Optional[Size2D],
+        /,
+    ) -> float:
+        """
+        Returns the scale of a plan of the specified size
+        satisfying both the scale and the maximum size.
+        """
+        scale = 1.0 if __scale is None else __scale
+        if __max_size is not None:
+            scale = min(
+                scale,
+                __max_size.width / __size.width,
+                __max_size.height / __size.height,
+            )
+        return scale
+
+    @classmethod
+    def _scale_plan(
+        cls,
+        __plan: RenderPlan,
+        __scale: float,
+        __level: RenderPlan,
+        /,
+    ) -> RenderPlan:
+        """
+        Builds a downscaled copy of the plan, so renders are composited at the lower resolution.
+
+        :param __plan: The full-size render plan, the geometry is scaled from.
+        :param __scale: The scale of the new plan.
+        :param __level: The plan the images are resampled from, at the same or a larger scale.
+
+        :return: A new `RenderPlan` object.
+        """
+
+        size, start_point, screenshot_size = cls._scale_geometry(
+            __plan.size, __plan.screenshot_start_point, __plan.screenshot_size, __scale
+        )
+        # images are resampled once with the best filter, as the plan is cached
+        frame = __level.frame.copy()
+        frame.resize(size, resampling=Resampling.QUALITY)
+        if __level.mask is not None:
+            mask = __level.mask.copy()
+            mask.resize(size, resampling=Resampling.QUALITY)
+        else:
+            mask = None
+
+        return cls._make_plan(
+            frame,
+            mask,
+            screenshot_start_point=start_point,
+            screenshot_size=screenshot_size,
+            rotate=__plan.rotate,
+        )
+
+    @staticmethod
+    def _scale_geometry(
+        __size: Size2D,
+        __screenshot_start_point: Point2D,
+        __screenshot_size: Size2D,
+        __scale: float,
+        /,
+    ) -> Tuple[Size2D, Point2D, Size2D]:
+        """
+        Scales the geometry of a full-size plan.
+
+        :param __size: The size of the rendered image.
+        :param __screenshot_start_point: The starting point of the screenshot on the rendered image.
+        :param __screenshot_size: The size of the screenshot on the rendered image.
+        :param __scale: The scale of the new plan.
+
+        :return: The scaled size of the rendered image, starting point and size of the screenshot.
+        """
+
+        def scaled(value: int) -> int:
+            return round(value * __scale)
+
+        size = Size2D._new(max(1, scaled(__size.width)), max(1, scaled(__size.height)))
+        # edges are scaled rather than sizes, so the screen stays aligned with the frame
+        start_point = Point2D._new(
+            scaled(__screenshot_start_point.x), scaled(__screenshot_start_point.y)
+        )
+        screenshot_size = Size2D._new(
+            max(
+                1,
+                scaled(__screenshot_start_point.x + __screenshot_size.width)
+                - start_point.x,
+            ),
+            max(
+                1,
+                scaled(__screenshot_start_point.y + __screenshot_size.height)
+                - start_point.y,
+            ),
+        )
+        return size, start_point, screenshot_size
+
+    @classmethod
+    def _read_screenshot(
+        cls,
+        __screenshot: Union["Renderer", BaseReader, Path],
+        /,
+        observers: Tuple[RenderObserver, ...] = (),
+    ) -> Union[bytes, "Renderer"]:
+        """
+        Reads the screenshot passed to a render method without decoding it.
+
+        :param __screenshot: The screenshot as an `Renderer` object, a `Reader` or a path.
+        :param observers: Optional. The observers notified of the `READ` stage.
+
+        :return: The encoded screenshot, or the `Renderer` object as is.
+        """
+        started_at = perf_counter()
         if isinstance(__screenshot, BaseReader):
-            screenshot = cls.from_reader(__screenshot)
+            data = __screenshot.read()
         elif isinstance(__screenshot, Path):
             with FileReader(__screenshot) as screenshot_reader:
-                screenshot = cls.from_reader(screenshot_reader)
+                data = screenshot_reader.read()
         else:
-            screenshot = __screenshot.copy()
+            return __screenshot
+        cls._emit(observers, RenderStage.READ, started_at, nbytes=len(data))
+        return data
 
-        with __template.frame as template_frame:
-            frame = cls.from_reader(template_frame)
+    @classmethod
+    def _screenshot_size(cls, __screenshot: Union[bytes, "Renderer"], /) -> Size2D:
+        """
+        Returns the size of the screenshot read by `_read_screenshot`.
+        """
+        if isinstance(__screenshot, bytes):
+            return cls.probe_size(__screenshot)
+        return __screenshot.size
 
-        placeholder = cls(frame.size)
+    @staticmethod
+    def _screenshot_size_hint(__plans: Iterable[RenderPlan], /) -> Size2D:
+        """
+        Returns the smallest size of a decoded screenshot that covers
+        the screens of all plans.
+        """
+        width, height = 1, 1
+        for plan in __plans:
+            width = max(width, plan.screenshot_size.width)
+            height = max(height, plan.screenshot_size.height)
+        return Size2D._new(width, height)
 
-        screenshot_orientation = screenshot.size.width <= screenshot.size.height
-        frame_orientation = frame.size.width <= frame.size.height
+    @classmethod
+    def _templates_size_hint(
+        cls,
+        __templates: Iterable[Template],
+        /,
+        *,
+        portrait: bool,
+        disable_rotate: bool,
+        scale: Optional[float],
+        max_size: Optional[Size2D],
+    ) -> Size2D:
+        """
+        Returns a size of a decoded screenshot that covers the screens of all templates,
+        computed from their geometry and probed frame sizes, so no frame has to be decoded.
 
-        if (
-            not disable_rotate
-            and screenshot_orientation != frame_orientation
-            and __template.device.can_rotate
-        ):
-            screenshot.rotate(-90)
-        if constrain_proportions:
-            screenshot_placeholder = cls(__template.screenshot_size)
-            screenshot_scale = min(
-                __template.screenshot_size.width / screenshot.size.width,
-                __template.screenshot_size.height / screenshot.size.height,
-            )
-            screenshot.resize(
-                Size2D(
-                    int(screenshot.size.width * screenshot_scale) or 1,
-                    int(screenshot.size.height * screenshot_scale) or 1,
+        The rotation and the scale are chosen as `_compile` does. Scaled edges
+        are rounded, so the size covers the one `_screenshot_size_hint` returns
+        for the plans of the templates.
+        """
+        width, height = 1, 1
+        for template in __templates:
+            frame_size = cls._frame_size(template)
+            frame_width, frame_height = frame_size.width, frame_size.height
+            screen_width = template.screenshot_size.width
+            screen_height = template.screenshot_size.height
+            if cls._rotates(
+                template, frame_size, portrait=portrait, disable_rotate=disable_rotate
+            ):
+                frame_width, frame_height = frame_height, frame_width
+                screen_width, screen_height = screen_height, screen_width
+            screen_scale = 1.0 if scale is None else scale
+            if max_size is not None:
+                screen_scale = min(
+                    screen_scale,
+                    max_size.width / frame_width,
+                    max_size.height / frame_height,
+                )
+            if screen_scale < 1:
+                # scaled edges are rounded, so a scaled screen can be a pixel larger
+                screen_width = min(
+                    screen_width, math.ceil(screen_width * screen_scale) + 1
+                )
+                screen_height = min(
+                    screen_height, math.ceil(screen_height * screen_scale) + 1
                 )
+            width = max(width, screen_width)
+            height = max(height, screen_height)
+        return Size2D._new(width, height)
+
+    @classmethod
+    def _decode_screenshot(
+        cls, __screenshot: Union[bytes, "Renderer"], __size_hint: Size2D, /
+    ) -> Self:
+        """
+        Decodes the screenshot read by `_read_screenshot`.
+
+        :param __screenshot: The encoded screenshot or a `Renderer` object.
+        :param __size_hint: The smallest size the screenshot will be used at.
+
+        :return: A new image, which can be modified.
+        """
+        if isinstance(__screenshot, bytes):
+            return cls.from_bytes(
+                __screenshot, size_hint=__size_hint, max_pixels=cls.max_decode_pixels
             )
-            screenshot_placeholder.put_image(
+        return __screenshot.copy()
+
+    @classmethod
+    def _prepare_screenshot(
+        cls,
+        __screenshot: "Renderer",
+        __plan: RenderPlan,
+        /,
+        constrain_proportions: bool = False,
+        resampling: Optional[Resampling] = None,
+    ) -> "Renderer":
+        """
+        Resizes the screenshot in place to fit the screen of the plan.
+
+        :param __screenshot: The decoded screenshot.
+        :param __plan: The render plan of the template.
+        :param constrain_proportions: Whether the screenshot proportions must be kept.
+        :param resampling: Optional. The resampling filter. Defaults to the `resampling` of the renderer class.
+
+        :return: The screenshot ready to be composited, which is centered
+                 on the screen by `_composite` if it is smaller.
+        """
+        __screenshot.resize(
+            cls._prepared_size(
+                __screenshot.size, __plan.screenshot_size, constrain_proportions
+            ),
+            resampling=resampling or cls.resampling,
+        )
+        return __screenshot
+
+    @staticmethod
+    def _prepared_size(
+        __size: Size2D, __screenshot_size: Size2D, __constrain_proportions: bool, /
+    ) -> Size2D:
+        """
+        Returns the size a decoded screenshot of the specified size is resized to
+        by `_prepare_screenshot` for a screen of the plan of the specified size.
+        """
+        if not __constrain_proportions:
+            return __screenshot_size
+        screenshot_scale = min(
+            __screenshot_size.width / __size.width,
+            __screenshot_size.height / __size.height,
+        )
+        return Size2D._new(
+            int(__size.width * screenshot_scale) or 1,
+            int(__size.height * screenshot_scale) or 1,
+        )
+
+    @staticmethod
+    def _screenshot_start_point(__plan: RenderPlan, __size: Size2D, /) -> Point2D:
+        """
+        Returns the starting point of a prepared screenshot of the specified size,
+        centered on the screen of the plan.
+        """
+        free_width = __plan.screenshot_size.width - __size.width
+        free_height = __plan.screenshot_size.height - __size.height
+        return Point2D._new(
+            __plan.screenshot_start_point.x + free_width // 2,
+            __plan.screenshot_start_point.y
+            # rounded up on rotated plans, as a centered screenshot
+            # on the unrotated frame is rounded towards its left edge
+            + ((free_height + 1) // 2 if __plan.rotate else free_height // 2),
+        )
+
+    @classmethod
+    def _composite(cls, __plan: RenderPlan, __screenshot: "Renderer", /) -> Self:
+        """
+        Composites the prepared screenshot with the frame of the plan.
+
+        The base of the plan is copied, and the frame is blended again
+        only over the screenshot, which is the only region that differs.
+        The base already has the alpha of the mask, so it is only restored
+        over the screenshot as well.
+
+        :param __plan: The render plan of the template.
+        :param __screenshot: The screenshot prepared by `_prepare_screenshot`, which is not modified.
+
+        :return: A new image containing the rendered template.
+        """
+        start_point = cls._screenshot_start_point(__plan, __screenshot.size)
+        placeholder = __plan.base.copy()
+        placeholder.put_image(__screenshot, start_point)
+        frame = __plan.frame.crop(start_point, __screenshot.size)
+        placeholder.put_image(frame, start_point, mask=frame)
+
+        if __plan.mask is not None:
+            size = frame.size
+            # released first, so the region reuses the memory of the frame region
+            del frame
+            region = placeholder.crop(start_point, size)
+            region.put_alpha(__plan.mask.crop(start_point, size))
+            placeholder.put_image(region, start_point)
+
+        return placeholder
+
+    @classmethod
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def render(  # noqa
+        cls,
+        __template: Template,
+        __screenshot: Union[SkipValidation["Renderer"], BaseReader, Path],
+        /,
+        disable_rotate: bool = False,
+        constrain_proportions: bool = False,
+        resampling: Optional[Resampling] = None,
+        scale: Optional[confloat(gt=0, le=1)] = None,
+        max_size: Optional[Size2D] = None,
+        *,
+        observer: SkipValidation[Optional[RenderObserver]] = None,
+        report: bool = False,
+    ):
+        render_report = RenderReport() if report else None
+        observers = cls._observers(observer, render_report)
+        rendered = cls._render(
+            __template,
+            cls._read_screenshot(__screenshot, observers),
+            disable_rotate=disable_rotate,
+            constrain_proportions=constrain_proportions,
+            resampling=resampling,
+            scale=scale,
+            max_size=max_size,
+            observers=observers,
+        )
+        if render_report is not None:
+            rendered.report = render_report
+        return rendered
+
+    @classmethod
+    def _render(
+        cls,
+        __template: Template,
+        __screenshot: Union[bytes, "Renderer"],
+        /,
+        *,
+        disable_rotate: bool,
+        constrain_proportions: bool,
+        resampling: Optional[Resampling],
+        scale: Optional[float],
+        max_size: Optional[Size2D],
+        observers: Tuple[RenderObserver, ...],
+        read: Optional[Callable[[Any], bytes]] = None,
+    ) -> Self:
+        """
+        Renders the template from a screenshot read by `_read_screenshot`.
+
+        :param read: Optional. Reads the encoded frame and mask. Defaults to `_read_template_image`.
+        """
+        screenshot_size = cls._screenshot_size(__screenshot)
+        plan = cls._compile(
+            __template,
+            portrait=screenshot_size.width <= screenshot_size.height,
+            disable_rotate=disable_rotate,
+            scale=scale,
+            max_size=max_size,
+            observers=observers,
+            read=read,
+        )
+
+        started_at = perf_counter()
+        screenshot = cls._decode_screenshot(
+            __screenshot, cls._screenshot_size_hint((plan,))
+        )
+        cls._emit(
+            observers,
+            RenderStage.DECODE,
+            started_at,
+            template=__template,
+            result=screenshot,
+            nbytes=len(__screenshot) if isinstance(__screenshot, bytes) else None,
+        )
+
+        started_at = perf_counter()
+        cls._prepare_screenshot(
+            screenshot,
+            plan,
+            constrain_proportions=constrain_proportions,
+            resampling=resampling,
+        )
+        cls._emit(
+            observers,
+            RenderStage.RESIZE,
+            started_at,
+            template=__template,
+            result=screenshot,
+        )
+
+        started_at = perf_counter()
+        rendered = cls._composite(plan, screenshot)
+        cls._emit(
+            observers,
+            RenderStage.COMPOSITE,
+            started_at,
+            template=__template,
+            result=rendered,
+        )
+        return rendered
+
+    @classmethod
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def render_encoded(  # noqa
+        cls,
+        __template: Template,
+        __screenshot: Union[SkipValidation["Renderer"], BaseReader, Path],
+        /,
+        disable_rotate: bool = False,
+        constrain_proportions: bool = False,
+        resampling: Optional[Resampling] = None,
+        scale: Optional[confloat(gt=0, le=1)] = None,
+        max_size: Optional[Size2D] = None,
+        *,
+        format: ImageFormat = ImageFormat.PNG,  # noqa
+        preset: EncodePreset = EncodePreset.BALANCED,
+        quality: Optional[conint(ge=1, le=100)] = None,
+        compress_level: Optional[conint(ge=0, le=9)] = None,
+        observer: SkipValidation[Optional[RenderObserver]] = None,
+    ) -> bytes:
+        observers = cls._observers(observer)
+        screenshot = cls._read_screenshot(__screenshot, observers)
+        result_cache = cls.result_cache
+        if result_cache is not None:
+            started_at = perf_counter()
+            key = cls._result_key(
+                __template,
                 screenshot,
-                Point2D(
-                    (screenshot_placeholder.size.width - screenshot.size.width) // 2,
-                    (screenshot_placeholder.size.height - screenshot.size.height) // 2,
-                ),
+                disable_rotate=disable_rotate,
+                constrain_proportions=constrain_proportions,
+                resampling=resampling or cls.resampling,
+                scale=scale,
+                max_size=max_size,
+                format=format,
+                preset=preset,
+                quality=quality,
+                compress_level=compress_level,
+            )
+            data = result_cache.get(key)
+            cls._emit(
+                observers,
+                RenderStage.CACHE,
+                started_at,
+                template=__template,
+                nbytes=len(data) if data is not None else None,
+                cache_hit=data is not None,
             )
-            screenshot = screenshot_placeholder
+            if data is not None:
+                return data
 
+        rendered = cls._render(
+            __template,
+            screenshot,
+            disable_rotate=disable_rotate,
+            constrain_proportions=constrain_proportions,
+            resampling=resampling,
+            scale=scale,
+            max_size=max_size,
+            observers=observers,
+        )
+        started_at = perf_counter()
+        data = rendered.encode(
+            format=format,
+            preset=preset,
+            quality=quality,
+            compress_level=compress_level,
+        )
+        cls._emit(
+            observers,
+            RenderStage.ENCODE,
+            started_at,
+            template=__template,
+            result=rendered,
+            nbytes=len(data),
+        )
+        if result_cache is not None:
+            result_cache.put(key, data)
+        return data
+
+    @classmethod
+    def _result_key(
+        cls, __template: Template, __screenshot: Union[bytes, "Renderer"], /, **options
+    ) -> str:
+        """
+        Returns the hexadecimal digest identifying an encoded render result.
+
+        The template version counter is local to the process, so the geometry
+        it tracks and the identities of the frame and the mask are hashed
+        instead, and keys stay stable across processes sharing a disk tier.
+
+        :param __template: The template to be rendered.
+        :param __screenshot: The screenshot read by `_read_screenshot`.
+        :param options: The render and encode options.
+
+        :return: The hexadecimal SHA-256 digest.
+        """
+        screenshot_digest = hashlib.sha256()
+        if isinstance(__screenshot, bytes):
+            screenshot_digest.update(__screenshot)
         else:
-            screenshot.resize(__template.screenshot_size)
+            screenshot_digest.update(
+                repr((__screenshot.size, __screenshot.mode)).encode()
+            )
+            screenshot_digest.update(__screenshot.to_buffer())
+        return hashlib.sha256(
+            repr(
+                (
+                    cls.__module__,
+                    cls.__qualname__,
+                    str(__template.id),
+                    __template.screenshot_start_point,
+                    __template.screenshot_size,
+                    cls._reader_identity(__template.frame),
+                    cls._reader_identity(__template.mask)
+                    if __template.mask
+                    else None,
+                    screenshot_digest.hexdigest(),
+                    sorted(options.items()),
+                )
+            ).encode()
+        ).hexdigest()
 
-        placeholder.put_image(screenshot, __template.screenshot_start_point)
-        placeholder.put_image(frame, mask=frame)
+    @classmethod
+    def _reader_identity(cls, __reader: BaseReader, /) -> str:
+        """
+        Returns a string identifying the content of a frame or a mask.
 
-        if __template.mask:
-            mask = Renderer.from_reader(__template.mask)
-            placeholder.put_alpha(mask)
+        Files are identified by their path, size and modification time,
+        as the disk frame cache does, other readers by the digest of their bytes,
+        which is computed once per reader, as plans are cached per reader as well.
 
-        if (
-            not disable_rotate
-            and screenshot_orientation != frame_orientation
-            and __template.device.can_rotate
-        ):
-            placeholder.rotate(90)
+        :param __reader: The reader of the image.
+        :return: The identity of the image.
+        """
+        if isinstance(__reader, FileReader):
+            path = __reader.path.resolve()
+            stat = path.stat()
+            return repr((str(path), stat.st_size, stat.st_mtime_ns))
+        # readers without weak references are hashed on every call
+        with suppress(TypeError):
+            if (digest := cls.__reader_digests.get(__reader)) is not None:
+                return digest
+        with __reader as reader:
+            digest = hashlib.sha256(reader.read()).hexdigest()
+        with suppress(TypeError):
+            cls.__reader_digests[__reader] = digest
+        return digest
 
-        return placeholder
+    @classmethod
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def render_many(  # noqa
+        cls,
+        __templates: Iterable[Template],
+        __screenshot: Union[SkipValidation["Renderer"], BaseReader, Path],
+        /,
+        disable_rotate: bool = False,
+        constrain_proportions: bool = False,
+        resampling: Optional[Resampling] = None,
+        scale: Optional[confloat(gt=0, le=1)] = None,
+        max_size: Optional[Size2D] = None,
+        *,
+        observer: SkipValidation[Optional[RenderObserver]] = None,
+        report: bool = False,
+    ) -> Generator[Self, None, None]:
+        render_report = RenderReport() if report else None
+        observers = cls._observers(observer, render_report)
+        source = cls._read_screenshot(__screenshot, observers)
+        source_size = cls._screenshot_size(source)
+        portrait = source_size.width <= source_size.height
+        templates = tuple(__templates)
+
+        started_at = perf_counter()
+        # plans are compiled one at a time in the loop, so only the plan of the current
+        # template is held and the frame cache budget applies to the whole batch
+        decoded = cls._decode_screenshot(
+            source,
+            cls._templates_size_hint(
+                templates,
+                portrait=portrait,
+                disable_rotate=disable_rotate,
+                scale=scale,
+                max_size=max_size,
+            ),
+        )
+        cls._emit(
+            observers,
+            RenderStage.DECODE,
+            started_at,
+            result=decoded,
+            nbytes=len(source) if isinstance(source, bytes) else None,
+        )
+        screenshots: Dict[Tuple[bool, int, int], "Renderer"] = dict()
+
+        for template in templates:
+            plan = cls._compile(
+                template,
+                portrait=portrait,
+                disable_rotate=disable_rotate,
+                scale=scale,
+                max_size=max_size,
+                observers=observers,
+            )
+            key = (
+                plan.rotate,
+                plan.screenshot_size.width,
+                plan.screenshot_size.height,
+            )
+            if (screenshot := screenshots.get(key)) is None:
+                started_at = perf_counter()
+                screenshot = screenshots[key] = cls._prepare_screenshot(
+                    decoded.copy(),
+                    plan,
+                    constrain_proportions=constrain_proportions,
+                    resampling=resampling,
+                )
+                cls._emit(
+                    observers,
+                    RenderStage.RESIZE,
+                    started_at,
+                    template=template,
+                    result=screenshot,
+                    cache_hit=False,
+                )
+            else:
+                cls._emit(
+                    observers,
+                    RenderStage.RESIZE,
+                    perf_counter(),
+                    template=template,
+                    result=screenshot,
+                    cache_hit=True,
+                )
+
+            started_at = perf_counter()
+            rendered = cls._composite(plan, screenshot)
+            cls._emit(
+                observers,
+                RenderStage.COMPOSITE,
+                started_at,
+                template=template,
+                result=rendered,
+            )
+            if render_report is not None:
+                rendered.report = render_report
+            yield rendered
+            del plan, rendered
+
+    @staticmethod
+    async def _read_template_image_async(__reader: BaseAsyncReader, /) -> bytes:
+        """
+        Asynchronously reads the encoded frame or mask of a template.
+        """
+        async with __reader as reader:
+            return await reader.read()
+
+    @classmethod
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    async def render_async(  # noqa
+        cls,
+        __template: Template,
+        __screenshot: Union[
+            SkipValidation["Renderer"], BaseReader, BaseAsyncReader, Path
+        ],
+        /,
+        disable_rotate: bool = False,
+        constrain_proportions: bool = False,
+        resampling: Optional[Resampling] = None,
+        scale: Optional[confloat(gt=0, le=1)] = None,
+        max_size: Optional[Size2D] = None,
+        *,
+        executor: SkipValidation[Optional[Executor]] = None,
+        observer: SkipValidation[Optional[RenderObserver]] = None,
+        report: bool = False,
+    ) -> SkipValidation[Self]:
+        loop = get_running_loop()
+        executor = executor or cls._get_executor()
+        render_report = RenderReport() if report else None
+        observers = cls._observers(observer, render_report)
+
+        async def read_screenshot():
+            if isinstance(__screenshot, BaseAsyncReader):
+                started_at = perf_counter()
+                async with __screenshot as reader:
+                    data = await reader.read()
+                cls._emit(observers, RenderStage.READ, started_at, nbytes=len(data))
+                return data
+            return await loop.run_in_executor(
+                executor, cls._read_screenshot, __screenshot, observers
+            )
+
+        def read_template_image(reader: Union[BaseReader, BaseAsyncReader]):
+            if isinstance(reader, BaseReader):
+                return cls._read_template_image(reader)
+            # the event loop is idle while the render runs in the executor,
+            # so asynchronous readers are read on the loop only when a plan is built
+            return run_coroutine_threadsafe(
+                cls._read_template_image_async(reader), loop
+            ).result()
+
+        screenshot = await read_screenshot()
+
+        def render():
+            return cls._render(
+                __template,
+                screenshot,
+                disable_rotate=disable_rotate,
+                constrain_proportions=constrain_proportions,
+                resampling=resampling,
+                scale=scale,
+                max_size=max_size,
+                observers=observers,
+                read=read_template_image,
+            )
+
+        rendered = await loop.run_in_executor(executor, render)
+        if render_report is not None:
+            rendered.report = render_report
+        return rendered
 
 
-__all__ = ("Renderer", "BaseRenderer")
+__all__ = (
+    "Renderer",
+    "BaseRenderer",
+    "FrameCache",
+    "DiskFrameCache",
+    "RenderPlan",
+    "RenderResultCache",
+    "RenderEvent",
+    "RenderObserver",
+    "RenderReport",
+)
@@ -0,0 +1,141 @@
+import hashlib
+import mmap
+import os
+import struct
+from contextlib import suppress
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Optional, Tuple
+
+from pydantic import validate_call, ConfigDict
+
+from ..models.size2d import Size2D
+
+_MAGIC = b"MEFC"
+_FORMAT_VERSION = 1
+# magic, format version, width, height, mode, padded so pixels are 64-byte aligned
+_HEADER = struct.Struct("<4sIII8s")
+_HEADER_SIZE = 64
+_ENTRY_SUFFIX = ".rgba"
+_MODES = ("L", "RGB", "RGBA")
+
+
+class DiskFrameCache:
+    """
+    Persistent cache of decoded template images stored as raw pixels.
+
+    Entries are keyed by the path, the size and the modification time of the source file,
+    and are memory-mapped on load, so the pixels are read from the page cache
+    without decoding. Entries are written atomically and can be shared between processes.
+    """
+
+    @validate_call
+    def __init__(self, __directory: Path, /):
+        """
+        :param __directory: The directory to store the entries in.
+        """
+        self.__directory = __directory  # get
+        self.__directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def directory(self) -> Path:
+        """
+        The directory the entries are stored in.
+        """
+        return self.__directory
+
+    @validate_call
+    def get(self, __source: Path, /) -> Optional[Tuple[Size2D, str, memoryview]]:
+        """
+        Get the decoded pixels of the source file.
+
+        :param __source: The path to the encoded source file.
+        :return: The size, the mode and a read-only memory-mapped view of the raw pixels,
+                 or None if the source is not cached or has changed.
+        """
+        entry_path = self.__entry_path(__source)
+        if entry_path is None:
+            return None
+        try:
+            with entry_path.open("rb") as entry_file:
+                mapping = mmap.mmap(entry_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if len(mapping) >= _HEADER.size:
+            magic, version, width, height, mode = _HEADER.unpack_from(mapping)
+            mode = mode.rstrip(b"\0").decode("ascii", "replace")
+            if (
+                magic == _MAGIC
+                and version == _FORMAT_VERSION
+                and mode in _MODES
+                and len(mapping) == _HEADER_SIZE + width * height * len(mode)
+            ):
+                return Size2D(width, height), mode, memoryview(mapping)[_HEADER_SIZE:]
+
+        mapping.close()
+        entry_path.unlink(missing_ok=True)
+        return None
+
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def put(self, __source: Path, __size: Size2D, __mode: str, __buffer: memoryview, /):
+        """
+        Store the decoded pixels of the source file, replacing entries of its previous versions.
+
+        Images in modes other than "L", "RGB" and "RGBA" are not cached.
+
+        :param __source: The path to the encoded source file.
+        :param __size: The size of the image.
+        :param __mode: The pixel layout of the buffer.
+        :param __buffer: The raw pixels, stored row by row without padding.
+        """
+        entry_path = self.__entry_path(__source)
+        if entry_path is None or __mode not in _MODES:
+            return
+
+        header = _HEADER.pack(
+            _MAGIC, _FORMAT_VERSION, __size.width, __size.height, __mode.encode()
+        )
+        entry_file = NamedTemporaryFile(
+            dir=self.__directory, suffix=".tmp", delete=False
+        )
+        try:
+            with entry_file:
+                entry_file.write(header.ljust(_HEADER_SIZE, b"\0"))
+                entry_file.write(__buffer)
+            os.replace(entry_file.name, entry_path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(entry_file.name)
+            raise
+
+        source_prefix = entry_path.name.split("-", 1)[0]
+        for stale_path in self.__directory.glob(f"{source_prefix}-*{_ENTRY_SUFFIX}"):
+            if stale_path != entry_path:
+                stale_path.unlink(missing_ok=True)
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        for entry_path in self.__directory.glob(f"*{_ENTRY_SUFFIX}"):
+            entry_path.unlink(missing_ok=True)
+
+    def __entry_path(self, __source: Path, /) -> Optional[Path]:
+        try:
+            source = __source.resolve()
+            stat = source.stat()
+        except FileNotFoundError:
+            return None
+        # entries of the same source share the prefix, so stale versions can be found
+        source_digest = hashlib.sha256(str(source).encode()).hexdigest()[:32]
+        version_digest = hashlib.sha256(
+            f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+        ).hexdigest()[:16]
+        return self.__directory / f"{source_digest}-{version_digest}{_ENTRY_SUFFIX}"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.__directory!r})"
+
+
+__all__ = ("DiskFrameCache",)
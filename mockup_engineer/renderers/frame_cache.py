@@ -0,0 +1,150 @@
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from pydantic import validate_call, conint
+
+
+class FrameCache:
+    """
+    Byte-budgeted LRU cache of render plans and other decoded template images.
+
+    Cached values are shared between renders and must be treated as read-only.
+    A full-size plan of a phone template holds two "RGBA" images of the frame,
+    about 37 MB for a 1570x2932 frame, so the default budget keeps the plans
+    of about 25 templates in one orientation.
+    """
+
+    @validate_call
+    def __init__(self, max_bytes: conint(ge=0) = 1024 * 1024 * 1024):
+        """
+        :param max_bytes: Optional. The maximum total size of cached entries in bytes.
+        """
+        self.__max_bytes = max_bytes  # get
+        self.__entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self.__size = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = RLock()
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        The maximum total size of cached entries in bytes.
+        """
+        return self.__max_bytes
+
+    @property
+    def size(self) -> int:
+        """
+        The current total size of cached entries in bytes.
+        """
+        return self.__size
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of lookups that were served from the cache.
+        """
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Number of lookups that were not found in the cache.
+        """
+        return self.__misses
+
+    def get(self, __key: Hashable, /) -> Optional[Any]:
+        """
+        Get a cached value and mark it as most recently used.
+
+        :param __key: The key of the value.
+        :return: The cached value or None if it is not cached.
+        """
+        with self.__lock:
+            entry = self.__entries.get(__key)
+            if entry is None:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(__key)
+            self.__hits += 1
+            return entry[0]
+
+    def put(self, __key: Hashable, __value: Any, __nbytes: int, /):
+        """
+        Put a value into the cache, evicting least recently used values
+        until the cache fits its byte budget.
+
+        Values larger than the whole budget are not cached.
+
+        :param __key: The key of the value.
+        :param __value: The value to be cached.
+        :param __nbytes: The size of the value in bytes.
+        """
+        with self.__lock:
+            self.__discard(__key)
+            if __nbytes > self.__max_bytes:
+                return
+            self.__entries[__key] = (__value, __nbytes)
+            self.__size += __nbytes
+            while self.__size > self.__max_bytes:
+                _, (_, evicted_nbytes) = self.__entries.popitem(last=False)
+                self.__size -= evicted_nbytes
+
+    def get_or_create(
+        self, __key: Hashable, __factory: Callable[[], Tuple[Any, int]], /
+    ) -> Any:
+        """
+        Get a cached value or create and cache it.
+
+        :param __key: The key of the value.
+        :param __factory: A callable returning the value and its size in bytes.
+        :return: The cached or created value.
+        """
+        if (value := self.get(__key)) is not None:
+            return value
+        value, nbytes = __factory()
+        self.put(__key, value, nbytes)
+        return value
+
+    def discard(self, __key: Hashable, /):
+        """
+        Remove a value from the cache if it is cached.
+
+        :param __key: The key of the value.
+        """
+        with self.__lock:
+            self.__discard(__key)
+
+    def clear(self):
+        """
+        Remove all values from the cache and reset the counters.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+            self.__hits = 0
+            self.__misses = 0
+
+    def __discard(self, __key: Hashable, /):
+        if (entry := self.__entries.pop(__key, None)) is not None:
+            self.__size -= entry[1]
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, __key: Hashable) -> bool:
+        return __key in self.__entries
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"max_bytes={self.__max_bytes!r}, "
+            f"size={self.__size!r}, "
+            f"hits={self.__hits!r}, "
+            f"misses={self.__misses!r})"
+        )
+
+
+__all__ = ("FrameCache",)
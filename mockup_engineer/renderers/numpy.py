@@ -0,0 +1,319 @@
+from pathlib import Path
+from typing import Self, Union, Optional, ClassVar, Dict, BinaryIO
+
+import PIL.Image
+from pydantic import validate_call, ConfigDict, SkipValidation, conint
+
+from . import BaseRenderer, FrameCache, RenderPlan
+from .pillow import PilRenderer, _open_image, _resize_image  # noqa
+from ..enums.encode_preset import EncodePreset
+from ..enums.image_format import ImageFormat
+from ..enums.resampling import Resampling
+from ..models.point2d import Point2D
+from ..models.size2d import Size2D
+from ..readers import BaseReader
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_CHANNELS: Dict[str, int] = {"L": 1, "RGB": 3, "RGBA": 4}
+_MODES: Dict[int, str] = {channels: mode for mode, channels in _CHANNELS.items()}
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("'numpy' is required to use NumpyRenderer")
+
+
+def _convert(__pixels: "numpy.ndarray", __channels: int, /) -> "numpy.ndarray":
+    """
+    Converts pixels of shape (..., C) to the specified number of channels
+    the same way Pillow converts between "L", "RGB" and "RGBA" modes.
+    """
+    channels = __pixels.shape[-1]
+    if channels == __channels:
+        return __pixels
+    if __channels == 1:
+        luma = (
+            __pixels[..., 0].astype(numpy.uint32) * 19595
+            + __pixels[..., 1].astype(numpy.uint32) * 38470
+            + __pixels[..., 2].astype(numpy.uint32) * 7471
+            + 0x8000
+        ) >> 16
+        return luma.astype(numpy.uint8)[..., None]
+    color = __pixels[..., :3] if channels == 4 else __pixels
+    if channels == 1:
+        color = numpy.repeat(color, 3, axis=-1)
+    if __channels == 3:
+        return color
+    opaque = numpy.full(color.shape[:-1] + (1,), 255, dtype=numpy.uint8)
+    return numpy.concatenate((color, opaque), axis=-1)
+
+
+def _mask_to_alpha(__pixels: "numpy.ndarray", /) -> "numpy.ndarray":
+    """
+    Returns the blending weights of a mask of shape (..., C) as (..., 1).
+    """
+    if __pixels.shape[-1] == 4:
+        return __pixels[..., 3:]
+    return _convert(__pixels, 1)
+
+
+def _blend(
+    __destination: "numpy.ndarray",
+    __source: "numpy.ndarray",
+    __alpha: "numpy.ndarray",
+    /,
+) -> "numpy.ndarray":
+    """
+    Blends source over destination with the weights from 0 to 255.
+
+    Arrays are broadcast, so stacks of images with a leading dimension
+    are blended at once. Rounding matches Pillow's `Image.paste`.
+    """
+    alpha = __alpha.astype(numpy.uint16)
+    blended = (
+        __destination.astype(numpy.uint16) * (255 - alpha)
+        + __source.astype(numpy.uint16) * alpha
+        + 128
+    )
+    return ((blended + (blended >> 8)) >> 8).astype(numpy.uint8)
+
+
+def _paste(
+    __destination: "numpy.ndarray",
+    __source: "numpy.ndarray",
+    __start_point: Point2D,
+    __alpha: Optional["numpy.ndarray"] = None,
+    /,
+):
+    """
+    Pastes source of shape (..., h, w, C) into destination of shape (..., H, W, C)
+    in place, clipping it to the destination bounds and blending it
+    with the optional weights of shape (..., h, w, 1).
+    """
+    x, y = __start_point.x, __start_point.y
+    height = min(__source.shape[-3], __destination.shape[-3] - y)
+    width = min(__source.shape[-2], __destination.shape[-2] - x)
+    if height <= 0 or width <= 0:
+        return
+    region = __destination[..., y : y + height, x : x + width, :]
+    source = __source[..., :height, :width, :]
+    if __alpha is None:
+        region[...] = source
+    else:
+        region[...] = _blend(region, source, __alpha[..., :height, :width, :])
+
+
+class NumpyRenderer(BaseRenderer):
+    """
+    Renderer holding images as `uint8` arrays of shape (height, width, channels)
+    with vectorized compositing.
+
+    Decoding, encoding and resampling are delegated to Pillow.
+    """
+
+    frame_cache: ClassVar[Optional[FrameCache]] = FrameCache()
+
+    __array: "numpy.ndarray"
+
+    def __init__(self, __size_or_array: Union[Size2D, "numpy.ndarray"], /):  # noqa
+        _require_numpy()
+        if isinstance(__size_or_array, Size2D):
+            self.__array = numpy.zeros(
+                (__size_or_array.height, __size_or_array.width, 4), dtype=numpy.uint8
+            )
+        else:
+            array = numpy.asarray(__size_or_array, dtype=numpy.uint8)
+            if array.ndim == 2:
+                array = array[..., None]
+            if array.ndim != 3 or array.shape[2] not in _MODES:
+                raise ValueError(f"Unsupported pixel array shape {array.shape!r}")
+            self.__array = array
+
+    @property
+    def array(self) -> "numpy.ndarray":
+        """
+        The pixels of the image as an array of shape (height, width, channels).
+        """
+        return self.__array
+
+    def __to_pil(self) -> PIL.Image.Image:
+        return PIL.Image.fromarray(
+            numpy.ascontiguousarray(self.__array.squeeze(axis=2))
+            if self.__array.shape[2] == 1
+            else numpy.ascontiguousarray(self.__array),
+            self.mode,
+        )
+
+    def __writeable(self) -> "numpy.ndarray":
+        if not self.__array.flags.writeable:
+            self.__array = self.__array.copy()
+        return self.__array
+
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def resize(self, __size: Size2D, /, resampling: Optional[Resampling] = None):
+        self.__array = numpy.asarray(
+            _resize_image(self.__to_pil(), __size, resampling or self.resampling)
+        ).reshape(__size.height, __size.width, self.__array.shape[2])
+
+    @validate_call
+    def rotate(self, __angle: float, /):
+        if __angle % 90 == 0:
+            self.__array = numpy.rot90(self.__array, int(__angle // 90) % 4)
+        else:
+            rotated = numpy.asarray(self.__to_pil().rotate(__angle, expand=True))
+            self.__array = rotated.reshape(
+                rotated.shape[0], rotated.shape[1], self.__array.shape[2]
+            )
+
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def put_image(
+        self,
+        __image: BaseRenderer,
+        __start_point: Point2D = Point2D(1, 1),
+        /,
+        *,
+        mask: Optional[BaseRenderer] = None,
+    ):
+        destination = self.__writeable()
+        _paste(
+            destination,
+            _convert(self.__coerce(__image).__array, destination.shape[2]),
+            __start_point,
+            _mask_to_alpha(self.__coerce(mask).__array) if mask is not None else None,
+        )
+
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def put_alpha(self, __image: BaseRenderer, /):
+        if self.__array.shape[2] != 4:
+            self.__array = _convert(self.__array, 4)
+        self.__writeable()[..., 3:] = _convert(self.__coerce(__image).__array, 1)
+
+    @validate_call
+    def convert(self, __mode: str, /):
+        if __mode not in _CHANNELS:
+            raise ValueError(f"Unsupported mode {__mode!r}")
+        self.__array = _convert(self.__array, _CHANNELS[__mode])
+
+    @classmethod
+    def composite_stack(
+        cls, __plan: RenderPlan, __screenshots: "numpy.ndarray", /
+    ) -> "numpy.ndarray":
+        """
+        Composites a stack of screenshots with the frame of the plan at once.
+
+        :param __plan: The render plan of the template, compiled by this renderer.
+        :param __screenshots: The screenshots prepared for the plan, as an array
+                              of shape (count, height, width, channels).
+
+        :return: The rendered images as an array of shape (count, height, width, 4).
+        """
+        _require_numpy()
+        screenshots = _convert(numpy.asarray(__screenshots, dtype=numpy.uint8), 4)
+        size = Size2D._new(screenshots.shape[2], screenshots.shape[1])
+        start_point = cls._screenshot_start_point(__plan, size)
+        canvas = numpy.repeat(
+            _convert(__plan.base.__array, 4)[None], screenshots.shape[0], axis=0
+        )
+        _paste(canvas, screenshots, start_point)
+        frame = __plan.frame.crop(start_point, size).__array
+        _paste(canvas, _convert(frame, 4), start_point, _mask_to_alpha(frame))
+        if __plan.mask is not None:
+            # the base has the alpha of the mask outside the screenshot
+            mask = __plan.mask.crop(start_point, size).__array
+            _paste(canvas[..., 3:], _convert(mask, 1), start_point)
+        return canvas
+
+    @classmethod
+    def __coerce(cls, __image: BaseRenderer, /) -> "NumpyRenderer":
+        if isinstance(__image, NumpyRenderer):
+            return __image
+        return NumpyRenderer.from_buffer(
+            __image.size, __image.to_buffer(), __image.mode
+        )
+
+    def to_buffer(self) -> memoryview:
+        return memoryview(numpy.ascontiguousarray(self.__array)).cast("B")
+
+    @classmethod
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def from_buffer(
+        cls, __size: Size2D, __buffer: memoryview, /, mode: str = "RGBA"
+    ) -> SkipValidation[Self]:
+        _require_numpy()
+        if mode not in _CHANNELS:
+            raise ValueError(f"Unsupported mode {mode!r}")
+        return cls(
+            numpy.frombuffer(__buffer, dtype=numpy.uint8).reshape(
+                __size.height, __size.width, _CHANNELS[mode]
+            )
+        )
+
+    @classmethod
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def from_bytes(
+        cls,
+        __data: bytes,
+        /,
+        *,
+        size_hint: Optional[Size2D] = None,
+        max_pixels: Optional[conint(gt=0)] = None,
+    ) -> SkipValidation[Self]:
+        _require_numpy()
+        image = _open_image(__data, size_hint=size_hint, max_pixels=max_pixels)
+        if image.mode not in _CHANNELS:
+            image = image.convert(
+                "RGBA"
+                if "A" in image.mode or "transparency" in image.info
+                else "RGB"
+            )
+        return cls(numpy.asarray(image))
+
+    @classmethod
+    @validate_call
+    def probe_size(cls, __data: bytes, /) -> Size2D:
+        return PilRenderer.probe_size(__data)
+
+    def encode(
+        self,
+        __destination: Optional[Union[Path, BaseReader, BinaryIO]] = None,
+        /,
+        *,
+        format: ImageFormat = ImageFormat.PNG,  # noqa
+        preset: EncodePreset = EncodePreset.BALANCED,
+        quality: Optional[int] = None,
+        compress_level: Optional[int] = None,
+    ) -> Optional[bytes]:
+        return PilRenderer(self.__to_pil()).encode(
+            __destination,
+            format=format,
+            preset=preset,
+            quality=quality,
+            compress_level=compress_level,
+        )
+
+    def copy(self) -> Self:
+        return self.__class__(self.__array.copy())
+
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def crop(self, __start_point: Point2D, __size: Size2D, /) -> SkipValidation[Self]:
+        return self.__class__(
+            self.__array[
+                __start_point.y : __start_point.y + __size.height,
+                __start_point.x : __start_point.x + __size.width,
+            ].copy()
+        )
+
+    @property
+    def size(self) -> Size2D:
+        return Size2D._new(self.__array.shape[1], self.__array.shape[0])
+
+    @property
+    def mode(self) -> str:
+        return _MODES[self.__array.shape[2]]
+
+
+__all__ = ("NumpyRenderer",)
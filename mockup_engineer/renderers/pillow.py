@@ -1,15 +1,117 @@
 from io import BytesIO
-from typing import Self, Union, Optional
+from pathlib import Path
+from typing import Self, Union, Optional, ClassVar, BinaryIO
 
 import PIL.Image
-from pydantic import validate_call, ConfigDict, SkipValidation
+from pydantic import validate_call, ConfigDict, SkipValidation, conint
 
-from . import BaseRenderer
+from . import BaseRenderer, FrameCache
+from ..enums.encode_preset import EncodePreset
+from ..enums.image_format import ImageFormat
+from ..enums.resampling import Resampling
+from ..exceptions.pixel_budget_exceeded import PixelBudgetExceeded
 from ..models.point2d import Point2D
 from ..models.size2d import Size2D
+from ..readers import BaseReader
+
+_PNG_COMPRESS_LEVELS = {
+    EncodePreset.FAST: 1,
+    EncodePreset.BALANCED: 6,
+    EncodePreset.SMALL: 9,
+}
+_WEBP_METHODS = {
+    EncodePreset.FAST: 0,
+    EncodePreset.BALANCED: 4,
+    EncodePreset.SMALL: 6,
+}
+_WEBP_DEFAULT_QUALITY = 80
+_JPEG_DEFAULT_QUALITY = 85
+# filter and reducing gap of each resampling, the image is first reduced
+# by an integer factor with a box filter while it stays `reducing_gap` times
+# larger than the target size, which bounds the cost of large downscales
+_RESAMPLING_FILTERS = {
+    Resampling.NEAREST: (PIL.Image.Resampling.NEAREST, None),
+    Resampling.BOX: (PIL.Image.Resampling.BOX, None),
+    Resampling.BILINEAR: (PIL.Image.Resampling.BILINEAR, None),
+    Resampling.HAMMING: (PIL.Image.Resampling.HAMMING, None),
+    Resampling.BICUBIC: (PIL.Image.Resampling.BICUBIC, None),
+    Resampling.LANCZOS: (PIL.Image.Resampling.LANCZOS, None),
+    Resampling.FAST: (PIL.Image.Resampling.BILINEAR, 2.0),
+    Resampling.QUALITY: (PIL.Image.Resampling.LANCZOS, None),
+}
+
+
+def _open_image(
+    __data: bytes,
+    /,
+    size_hint: Optional[Size2D] = None,
+    max_pixels: Optional[int] = None,
+) -> PIL.Image.Image:
+    """
+    Decodes the image, reducing its scale while it stays at least `size_hint` large.
+
+    JPEG images are decoded at a reduced scale directly by the draft mode,
+    other images are reduced by an integer factor right after decoding.
+    The size the image is going to be decoded at is checked against `max_pixels`
+    before any pixel is decoded.
+    """
+    image = PIL.Image.open(BytesIO(__data))
+    if size_hint is not None:
+        image.draft(image.mode, (size_hint.width, size_hint.height))
+    if max_pixels is not None and image.width * image.height > max_pixels:
+        raise PixelBudgetExceeded(
+            f"Image of {image.width}x{image.height} pixels"
+            f" exceeds the budget of {max_pixels} pixels"
+        )
+    image.load()
+    if size_hint is not None:
+        factor = min(
+            image.width // size_hint.width,
+            image.height // size_hint.height,
+        )
+        if factor >= 2:
+            image = image.reduce(factor)
+    return image
+
+
+def _buffer_mode(__image: PIL.Image.Image, /) -> str:
+    """
+    Returns the mode the raw pixels of the image are exchanged in.
+
+    Pixels of palette images are indices into the palette, which raw buffers
+    don't carry, so they are exchanged as the colors they refer to.
+    """
+    if __image.mode == "PA":
+        return "RGBA"
+    if __image.mode == "P":
+        return "RGBA" if "transparency" in __image.info else "RGB"
+    return __image.mode
+
+
+def _resize_image(
+    __image: PIL.Image.Image, __size: Size2D, __resampling: Resampling, /
+) -> PIL.Image.Image:
+    """
+    Resizes the image with the filter of the resampling.
+    """
+    resample, reducing_gap = _RESAMPLING_FILTERS[__resampling]
+    if reducing_gap is not None:
+        # reduced before `resize`, which would premultiply alpha of the full image first
+        factor = int(
+            min(
+                __image.width / __size.width,
+                __image.height / __size.height,
+            )
+            / reducing_gap
+        )
+        if factor >= 2:
+            __image = __image.reduce(factor)
+    return __image.resize((__size.width, __size.height), resample)
 
 
 class PilRenderer(BaseRenderer):
+    frame_cache: ClassVar[Optional[FrameCache]] = FrameCache()
+
     __proxy: PIL.Image.Image
 
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
@@ -20,13 +122,14 @@ class PilRenderer(BaseRenderer):
             )
         else:
             self.__proxy = __size_or_pil_image
-            __size_or_pil_image = Size2D(*self.__proxy.size)
+            __size_or_pil_image = Size2D._new(*self.__proxy.size)
         super().__init__(__size_or_pil_image)
 
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
-    def resize(self, __size: Size2D, /):
-        self.__proxy = self.__proxy.resize((__size.width, __size.height))
-        print(self.__proxy)
+    def resize(self, __size: Size2D, /, resampling: Optional[Resampling] = None):
+        self.__proxy = _resize_image(
+            self.__proxy, __size, resampling or self.resampling
+        )
 
     @validate_call
     def rotate(self, __angle: float, /):
@@ -41,41 +144,151 @@ class PilRenderer(BaseRenderer):
         *,
         mask: Optional[BaseRenderer] = None,
     ):
-        if isinstance(__image, PilRenderer):
-            __temp_image = __image
-        else:
-            __temp_image = PilRenderer.from_bytes(__image.to_bytes())
-        if mask is not None and not isinstance(mask, PilRenderer):
-            mask = PilRenderer.from_bytes(mask.to_bytes())
         self.__proxy.paste(
-            __temp_image.__proxy,
+            self.__coerce(__image).__proxy,
             (__start_point.x, __start_point.y),
-            mask.__proxy if mask is not None else None,
+            self.__coerce(mask).__proxy if mask is not None else None,
         )
 
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
     def put_alpha(self, __image: BaseRenderer, /):
+        alpha = self.__coerce(__image).__proxy
+        if alpha.mode not in ("1", "L"):
+            alpha = alpha.convert("L")
+        self.__proxy.putalpha(alpha)
+
+    @validate_call
+    def convert(self, __mode: str, /):
+        self.__proxy = self.__proxy.convert(__mode)
+
+    @classmethod
+    def __coerce(cls, __image: BaseRenderer, /) -> "PilRenderer":
         if isinstance(__image, PilRenderer):
-            __temp_image = __image
-        else:
-            __temp_image = PilRenderer.from_bytes(__image.to_bytes())
+            return __image
+        return PilRenderer.from_buffer(__image.size, __image.to_buffer(), __image.mode)
+
+    def to_buffer(self) -> memoryview:
+        """
+        Exports raw pixels of the image in the layout described by `mode`.
+
+        Pillow stores images in blocks of rows, so the pixels are always
+        copied into a new buffer, which can be modified.
+
+        :return: A `memoryview` of a copy of the raw pixels.
+        """
+        image = self.__proxy
+        if (mode := _buffer_mode(image)) != image.mode:
+            image = image.convert(mode)
+        return memoryview(image.tobytes())
+
+    @classmethod
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def from_buffer(
+        cls, __size: Size2D, __buffer: memoryview, /, mode: str = "RGBA"
+    ) -> SkipValidation[Self]:
+        return cls(
+            PIL.Image.frombuffer(
+                mode, (__size.width, __size.height), __buffer, "raw", mode, 0, 1
+            )
+        )
 
-        self.__proxy.putalpha(__temp_image)
+    @classmethod
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def from_bytes(
+        cls,
+        __data: bytes,
+        /,
+        *,
+        size_hint: Optional[Size2D] = None,
+        max_pixels: Optional[conint(gt=0)] = None,
+    ) -> SkipValidation[Self]:
+        return cls(_open_image(__data, size_hint=size_hint, max_pixels=max_pixels))
 
     @classmethod
     @validate_call
-    def from_bytes(cls, __data: bytes, /) -> SkipValidation[Self]:
-        return cls(PIL.Image.open(BytesIO(__data)))
+    def probe_size(cls, __data: bytes, /) -> Size2D:
+        with PIL.Image.open(BytesIO(__data)) as image:
+            return Size2D(*image.size)
+
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def encode(
+        self,
+        __destination: Optional[Union[Path, BaseReader, SkipValidation[BinaryIO]]] = None,
+        /,
+        *,
+        format: ImageFormat = ImageFormat.PNG,  # noqa
+        preset: EncodePreset = EncodePreset.BALANCED,
+        quality: Optional[conint(ge=1, le=100)] = None,
+        compress_level: Optional[conint(ge=0, le=9)] = None,
+    ) -> Optional[bytes]:
+        image = self.__proxy
+        if format == ImageFormat.PNG:
+            params = dict(
+                compress_level=_PNG_COMPRESS_LEVELS[preset]
+                if compress_level is None
+                else compress_level
+            )
+        elif format == ImageFormat.WEBP:
+            params = dict(
+                quality=quality or _WEBP_DEFAULT_QUALITY,
+                method=_WEBP_METHODS[preset],
+            )
+        else:
+            image = self.__flatten(image)
+            params = dict(
+                quality=quality or _JPEG_DEFAULT_QUALITY,
+                optimize=preset == EncodePreset.SMALL,
+            )
+
+        if __destination is None:
+            buffer = BytesIO()
+            image.save(buffer, format.name, **params)
+            return buffer.getvalue()
+        elif isinstance(__destination, BaseReader):
+            buffer = BytesIO()
+            image.save(buffer, format.name, **params)
+            with __destination as writer, buffer.getbuffer() as data:
+                writer.write(data)  # type: ignore
+        else:
+            image.save(__destination, format.name, **params)
+
+    @staticmethod
+    def __flatten(__image: PIL.Image.Image, /) -> PIL.Image.Image:
+        if __image.mode == "RGB":
+            return __image
+        if __image.mode != "RGBA":
+            __image = __image.convert("RGBA")
+        background = PIL.Image.new("RGB", __image.size, (255, 255, 255))
+        background.paste(__image, mask=__image.getchannel("A"))
+        return background
 
-    def to_bytes(self) -> bytes:
-        b = BytesIO()
-        self.__proxy.save(b, "PNG")
-        b.seek(0)
-        return b.read()
+    def copy(self) -> Self:
+        return self.__class__(self.__proxy.copy())
+
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def crop(self, __start_point: Point2D, __size: Size2D, /) -> SkipValidation[Self]:
+        return self.__class__(
+            self.__proxy.crop(
+                (
+                    __start_point.x,
+                    __start_point.y,
+                    min(__start_point.x + __size.width, self.__proxy.width),
+                    min(__start_point.y + __size.height, self.__proxy.height),
+                )
+            )
+        )
 
     @property
     def size(self) -> Size2D:
-        return Size2D(*self.__proxy.size)
+        return Size2D._new(*self.__proxy.size)
+
+    @property
+    def mode(self) -> str:
+        """
+        The pixel layout of the raw buffer. Palette images are exchanged
+        as "RGB" or "RGBA" images, as the buffer doesn't carry the palette.
+        """
+        return _buffer_mode(self.__proxy)
 
 
 __all__ = ("PilRenderer",)
@@ -0,0 +1,203 @@
+from threading import Lock
+from typing import Optional, Tuple, Dict, Any, List
+from uuid import UUID
+
+from ..enums.render_stage import RenderStage
+from ..models.size2d import Size2D
+
+
+class RenderEvent:
+    """
+    A stage of the render pipeline that has finished.
+
+    Events are immutable and can be shared between threads.
+    """
+
+    __slots__ = (
+        "__stage",
+        "__duration",
+        "__template_id",
+        "__size",
+        "__nbytes",
+        "__cache_hit",
+    )
+
+    def __init__(
+        self,
+        *,
+        stage: RenderStage,
+        duration: float,
+        template_id: Optional[UUID] = None,
+        size: Optional[Size2D] = None,
+        nbytes: Optional[int] = None,
+        cache_hit: Optional[bool] = None,
+    ):
+        """
+        :param stage: The stage of the render pipeline.
+        :param duration: The wall time of the stage in seconds.
+        :param template_id: Optional. The ID of the template the stage belongs to.
+        :param size: Optional. The size of the image produced by the stage.
+        :param nbytes: Optional. The number of encoded bytes read or written by the stage.
+        :param cache_hit: Optional. Whether the stage was served from a cache.
+        """
+        self.__stage = stage
+        self.__duration = duration
+        self.__template_id = template_id
+        self.__size = size
+        self.__nbytes = nbytes
+        self.__cache_hit = cache_hit
+
+    @property
+    def stage(self) -> RenderStage:
+        """
+        The stage of the render pipeline.
+        """
+        return self.__stage
+
+    @property
+    def duration(self) -> float:
+        """
+        The wall time of the stage in seconds.
+        """
+        return self.__duration
+
+    @property
+    def template_id(self) -> Optional[UUID]:
+        """
+        The ID of the template the stage belongs to,
+        or None for stages shared between templates.
+        """
+        return self.__template_id
+
+    @property
+    def size(self) -> Optional[Size2D]:
+        """
+        The size of the image produced by the stage, or None if no image is produced.
+        """
+        return self.__size
+
+    @property
+    def nbytes(self) -> Optional[int]:
+        """
+        The number of encoded bytes read or written by the stage, or None if unknown.
+        """
+        return self.__nbytes
+
+    @property
+    def cache_hit(self) -> Optional[bool]:
+        """
+        Whether the stage was served from a cache, or None if the stage is not cached.
+        """
+        return self.__cache_hit
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the event to a dictionary of JSON-serializable values.
+
+        :return: A dictionary with the stage, the duration in seconds and the set optional fields.
+        """
+        data: Dict[str, Any] = dict(stage=self.__stage.value, duration=self.__duration)
+        if self.__template_id is not None:
+            data["template_id"] = str(self.__template_id)
+        if self.__size is not None:
+            data["width"] = self.__size.width
+            data["height"] = self.__size.height
+        if self.__nbytes is not None:
+            data["nbytes"] = self.__nbytes
+        if self.__cache_hit is not None:
+            data["cache_hit"] = self.__cache_hit
+        return data
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"stage={self.__stage!r}, "
+            f"duration={self.__duration!r}, "
+            f"template_id={self.__template_id!r}, "
+            f"size={self.__size!r}, "
+            f"nbytes={self.__nbytes!r}, "
+            f"cache_hit={self.__cache_hit!r})"
+        )
+
+
+class RenderObserver:
+    """
+    Base class for observers of the render pipeline.
+
+    Observers are notified from the threads running the stages,
+    so they must be thread-safe and should return quickly.
+    """
+
+    def on_event(self, __event: RenderEvent, /):
+        """
+        Called when a stage of the render pipeline has finished. Does nothing by default.
+
+        :param __event: The finished stage.
+        """
+
+
+class RenderReport(RenderObserver):
+    """
+    Observer collecting the stages of a render, attached to the rendered image
+    when a render method is called with `report=True`.
+    """
+
+    def __init__(self):
+        self.__events: List[RenderEvent] = []
+        self.__lock = Lock()
+
+    def on_event(self, __event: RenderEvent, /):
+        with self.__lock:
+            self.__events.append(__event)
+
+    @property
+    def events(self) -> Tuple[RenderEvent, ...]:
+        """
+        The collected events in the order the stages have finished.
+        """
+        with self.__lock:
+            return tuple(self.__events)
+
+    @property
+    def duration(self) -> float:
+        """
+        The total wall time of the collected stages in seconds.
+        Stages running concurrently are counted separately.
+        """
+        return sum(event.duration for event in self.events)
+
+    def durations(self) -> Dict[RenderStage, float]:
+        """
+        Sums the wall time of the collected events by stage.
+
+        :return: A dictionary of the total wall time in seconds by stage, in the order of the first events.
+        """
+        durations: Dict[RenderStage, float] = dict()
+        for event in self.events:
+            durations[event.stage] = durations.get(event.stage, 0.0) + event.duration
+        return durations
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the report to a dictionary of JSON-serializable values.
+
+        :return: A dictionary with the total duration and the list of events.
+        """
+        return dict(
+            duration=self.duration,
+            events=[event.to_dict() for event in self.events],
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"events={len(self.events)!r}, "
+            f"duration={self.duration!r})"
+        )
+
+
+__all__ = (
+    "RenderEvent",
+    "RenderObserver",
+    "RenderReport",
+)
@@ -0,0 +1,131 @@
+from typing import Optional, TYPE_CHECKING
+
+from ..models.point2d import Point2D
+from ..models.size2d import Size2D
+
+if TYPE_CHECKING:
+    from . import Renderer
+
+
+class RenderPlan:
+    """
+    Precomputed data required to render a template for one screenshot orientation.
+
+    Plans are immutable and can be shared between threads.
+    """
+
+    __slots__ = (
+        "__frame",
+        "__base",
+        "__mask",
+        "__screenshot_start_point",
+        "__screenshot_size",
+        "__size",
+        "__rotate",
+    )
+
+    def __init__(
+        self,
+        *,
+        frame: "Renderer",
+        base: "Renderer",
+        mask: Optional["Renderer"],
+        screenshot_start_point: Point2D,
+        screenshot_size: Size2D,
+        size: Size2D,
+        rotate: bool,
+    ):
+        """
+        :param frame: The template frame, aligned with the rendered image.
+        :param base: The frame composited over a transparent image,
+                     with the alpha of the mask if there is one.
+        :param mask: Optional. The alpha plane of the rendered image as an "L" image.
+        :param screenshot_start_point: The starting point of the screenshot on the rendered image.
+        :param screenshot_size: The size of the screenshot on the rendered image.
+        :param size: The size of the rendered image.
+        :param rotate: Whether the frame is rotated to fit the screenshot.
+        """
+        self.__frame = frame
+        self.__base = base
+        self.__mask = mask
+        self.__screenshot_start_point = screenshot_start_point
+        self.__screenshot_size = screenshot_size
+        self.__size = size
+        self.__rotate = rotate
+
+    @property
+    def frame(self) -> "Renderer":
+        """
+        The template frame, aligned with the rendered image, so it is put
+        at its origin. Must not be modified.
+        """
+        return self.__frame
+
+    @property
+    def base(self) -> "Renderer":
+        """
+        The frame composited over a transparent image, with the alpha of the mask
+        if there is one, which is the rendered image outside the screenshot.
+        Must not be modified.
+        """
+        return self.__base
+
+    @property
+    def mask(self) -> Optional["Renderer"]:
+        """
+        The alpha plane of the rendered image as an "L" image, built from the template mask.
+        Must not be modified.
+        """
+        return self.__mask
+
+    @property
+    def screenshot_start_point(self) -> Point2D:
+        """
+        The starting point of the screenshot on the rendered image.
+        """
+        return self.__screenshot_start_point
+
+    @property
+    def screenshot_size(self) -> Size2D:
+        """
+        The size of the screenshot on the rendered image.
+        """
+        return self.__screenshot_size
+
+    @property
+    def size(self) -> Size2D:
+        """
+        The size of the rendered image.
+        """
+        return self.__size
+
+    @property
+    def rotate(self) -> bool:
+        """
+        Whether the frame, the mask and the screen geometry are rotated
+        by 90 degrees counterclockwise to fit the screenshot.
+        """
+        return self.__rotate
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the plan images in bytes.
+        """
+        return sum(
+            image.size.width * image.size.height * len(image.mode)
+            for image in (self.__frame, self.__base, self.__mask)
+            if image is not None
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"screenshot_start_point={self.__screenshot_start_point!r}, "
+            f"screenshot_size={self.__screenshot_size!r}, "
+            f"size={self.__size!r}, "
+            f"rotate={self.__rotate!r})"
+        )
+
+
+__all__ = ("RenderPlan",)
@@ -0,0 +1,248 @@
+import os
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Iterator, Optional
+
+from pydantic import validate_call, conint
+
+from .frame_cache import FrameCache
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_LOCK_FILE_NAME = ".lock"
+_SIZE_FILE_NAME = ".size"
+_ENTRY_SUFFIX = ".bin"
+# eviction frees space down to this fraction of the cap,
+# so the directory is scanned once per many writes
+_EVICTION_TARGET = 0.9
+
+
+class RenderResultCache:
+    """
+    Two-tier cache of encoded render results, keyed by content digests.
+
+    The memory tier is a byte-budgeted LRU. The optional disk tier is a directory
+    of entries capped by total size, which can be shared between processes:
+    entries are written atomically and the directory is locked with `fcntl`
+    where it is available. The total size is kept in a counter file,
+    so the directory is only scanned when the cap is exceeded.
+    """
+
+    @validate_call
+    def __init__(
+        self,
+        max_bytes: conint(ge=0) = 64 * 1024 * 1024,
+        *,
+        directory: Optional[Path] = None,
+        max_disk_bytes: conint(ge=0) = 1024 * 1024 * 1024,
+    ):
+        """
+        :param max_bytes: Optional. The maximum total size of entries kept in memory in bytes.
+        :param directory: Optional. The directory of the disk tier. The disk tier is disabled if not set.
+        :param max_disk_bytes: Optional. The maximum total size of entries kept on disk in bytes.
+        """
+        self.__memory = FrameCache(max_bytes)
+        self.__directory = directory  # get
+        self.__max_disk_bytes = max_disk_bytes  # get
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = Lock()
+        if self.__directory is not None:
+            self.__directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def directory(self) -> Optional[Path]:
+        """
+        The directory of the disk tier, or None if the disk tier is disabled.
+        """
+        return self.__directory
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        The maximum total size of entries kept in memory in bytes.
+        """
+        return self.__memory.max_bytes
+
+    @property
+    def max_disk_bytes(self) -> int:
+        """
+        The maximum total size of entries kept on disk in bytes.
+        """
+        return self.__max_disk_bytes
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of lookups that were served from either tier.
+        """
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Number of lookups that were not found in any tier.
+        """
+        return self.__misses
+
+    @validate_call
+    def get(self, __key: str, /) -> Optional[bytes]:
+        """
+        Get an encoded result. Entries found on disk are promoted to memory.
+
+        :param __key: The hexadecimal digest of the result.
+        :return: The encoded result or None if it is not cached.
+        """
+        data = self.__memory.get(__key)
+        if data is None and self.__directory is not None:
+            data = self.__read(__key)
+            if data is not None:
+                self.__memory.put(__key, data, len(data))
+        with self.__lock:
+            if data is None:
+                self.__misses += 1
+            else:
+                self.__hits += 1
+        return data
+
+    @validate_call
+    def put(self, __key: str, __data: bytes, /):
+        """
+        Put an encoded result into both tiers, evicting the least recently used entries.
+
+        :param __key: The hexadecimal digest of the result.
+        :param __data: The encoded result.
+        """
+        self.__memory.put(__key, __data, len(__data))
+        if self.__directory is not None and len(__data) <= self.__max_disk_bytes:
+            self.__write(__key, __data)
+
+    def clear(self):
+        """
+        Remove all entries from both tiers and reset the counters.
+        """
+        self.__memory.clear()
+        with self.__lock:
+            self.__hits = 0
+            self.__misses = 0
+        if self.__directory is not None:
+            with self.__locked(exclusive=True):
+                for path in self.__entries():
+                    path.unlink(missing_ok=True)
+                self.__write_total(0)
+
+    def __path(self, __key: str, /) -> Path:
+        return self.__directory / f"{__key}{_ENTRY_SUFFIX}"
+
+    def __entries(self) -> Iterator[Path]:
+        return self.__directory.glob(f"*{_ENTRY_SUFFIX}")
+
+    @contextmanager
+    def __locked(self, *, exclusive: bool):
+        with self.__lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.__directory / _LOCK_FILE_NAME, "a+b") as lock_file:
+                fcntl.flock(
+                    lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+                )
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def __read(self, __key: str, /) -> Optional[bytes]:
+        path = self.__path(__key)
+        with self.__locked(exclusive=False):
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                return None
+            # the modification time orders entries for eviction
+            os.utime(path)
+        return data
+
+    def __write(self, __key: str, __data: bytes, /):
+        # the entry is written before locking, so writers only wait for each other
+        # to move entries into place and update the total size
+        entry_file = NamedTemporaryFile(
+            dir=self.__directory, suffix=".tmp", delete=False
+        )
+        try:
+            with entry_file:
+                entry_file.write(__data)
+            with self.__locked(exclusive=True):
+                path = self.__path(__key)
+                try:
+                    replaced_size = path.stat().st_size
+                except FileNotFoundError:
+                    replaced_size = 0
+                os.replace(entry_file.name, path)
+                if (total := self.__read_total()) is None:
+                    total = self.__evict(self.__max_disk_bytes)
+                else:
+                    total += len(__data) - replaced_size
+                    if total > self.__max_disk_bytes:
+                        total = self.__evict(
+                            int(self.__max_disk_bytes * _EVICTION_TARGET)
+                        )
+                self.__write_total(total)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(entry_file.name)
+            raise
+
+    def __read_total(self) -> Optional[int]:
+        """
+        Reads the total size of entries, or None if the counter is missing or corrupted.
+        """
+        try:
+            return int((self.__directory / _SIZE_FILE_NAME).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def __write_total(self, __total: int, /):
+        (self.__directory / _SIZE_FILE_NAME).write_text(str(__total))
+
+    def __evict(self, __max_bytes: int, /) -> int:
+        """
+        Scans the directory and removes the least recently used entries
+        until their total size is at most `__max_bytes`.
+
+        :return: The total size of the remaining entries.
+        """
+        entries = []
+        total = 0
+        for path in self.__entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        for _, entry_size, path in entries:
+            if total <= __max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= entry_size
+        return total
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"max_bytes={self.max_bytes!r}, "
+            f"directory={self.__directory!r}, "
+            f"max_disk_bytes={self.__max_disk_bytes!r}, "
+            f"hits={self.__hits!r}, "
+            f"misses={self.__misses!r})"
+        )
+
+
+__all__ = ("RenderResultCache",)
@@ -1,26 +1,138 @@
-from contextlib import suppress
-from typing import List, Iterator
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID
 
 from pydantic import validate_call, ConfigDict, UUID4
 
+from .enums.device_type import DeviceType
 from .exceptions.device_not_found import DeviceNotFound
 from .exceptions.duplicate_identifier import DuplicateIdentifier
 from .exceptions.template_not_found import TemplateNotFound
+from .models.color import Color
 from .models.device import Device
+from .models.size2d import Size2D
 from .models.template import Template
 from .repositories import BaseRepository, BaseAsyncRepository
 from .singleton_meta import SingletonMeta
 
+M = TypeVar("M", Device, Template)
+
+
+class _Index(Generic[M]):
+    """
+    Secondary index of devices or templates by a key.
+
+    Models with equal keys share a bucket, an insertion ordered set
+    of models compared by identity. Sorted indexes also keep
+    the distinct keys in order, so ranges of keys are found by bisection.
+    """
+
+    __slots__ = ("__buckets", "__keys")
+
+    def __init__(self, *, sorted: bool = False):  # noqa
+        """
+        :param sorted: Optional. Whether the index supports range lookups.
+        """
+        self.__buckets: Dict[Hashable, Dict[M, None]] = dict()
+        self.__keys: Optional[List[Any]] = list() if sorted else None
+
+    def add(self, __key: Hashable, __model: M, /):
+        """
+        Adds a model to the bucket of the key.
+
+        :param __key: The key of the model.
+        :param __model: The device or template to add.
+        """
+        if (bucket := self.__buckets.get(__key)) is None:
+            bucket = self.__buckets[__key] = dict()
+            if self.__keys is not None:
+                insort(self.__keys, __key)
+        bucket[__model] = None
+
+    def remove(self, __key: Hashable, __model: M, /):
+        """
+        Removes a model from the bucket of the key.
+
+        :param __key: The key the model was added with.
+        :param __model: The device or template to remove.
+        """
+        bucket = self.__buckets[__key]
+        del bucket[__model]
+        if not bucket:
+            del self.__buckets[__key]
+            if self.__keys is not None:
+                del self.__keys[bisect_left(self.__keys, __key)]
+
+    def get(self, __key: Hashable, /) -> Dict[M, None]:
+        """
+        Gets the models with the key.
+
+        :param __key: The key to look up.
+        :return: The set of models, which must not be modified.
+        """
+        return self.__buckets.get(__key, _EMPTY)
+
+    def range(
+        self, __start: Optional[Any], __stop: Optional[Any], /
+    ) -> Tuple[int, Iterator[M]]:
+        """
+        Gets the models with keys in the range of a sorted index.
+
+        :param __start: The lowest key, inclusive, or None for no lower bound.
+        :param __stop: The highest key, inclusive, or None for no upper bound.
+        :return: The number of models and a lazy iterator over them in the order of their keys.
+        """
+        keys = self.__keys[
+            0 if __start is None else bisect_left(self.__keys, __start) :
+            len(self.__keys) if __stop is None else bisect_right(self.__keys, __stop)
+        ]
+        buckets = [self.__buckets[key] for key in keys]
+        return sum(map(len, buckets)), chain.from_iterable(buckets)
+
+
+_EMPTY: Dict[Any, None] = dict()
+
 
 class TemplateStorage(metaclass=SingletonMeta):
     """
     Storage for devices and associated templates.
+
+    Devices and templates are indexed by ID, and by the fields `query`
+    filters on. The indexes are kept up to date when stored devices
+    and templates change.
     """
 
-    __devices: List[Device]
+    __devices: Dict[UUID, Device]
+    __templates: Dict[UUID, Template]
 
     def __init__(self):  # noqa
-        self.__devices = []
+        # devices by ID, in the order they were appended
+        self.__devices = dict()
+        # templates of all devices by ID
+        self.__templates = dict()
+        # secondary indexes of devices, which are several times smaller
+        # than indexing the fields of devices for each of their templates
+        self.__by_manufacturer: _Index[Device] = _Index()
+        self.__by_type: _Index[Device] = _Index()
+        self.__by_released_at: _Index[Device] = _Index(sorted=True)
+        # by the number of pixels, as sizes have no order
+        self.__by_resolution: _Index[Device] = _Index(sorted=True)
+        # secondary indexes of templates
+        self.__by_color: _Index[Template] = _Index()
+        self.__by_emoji: _Index[Template] = _Index()
 
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
     def append(self, __device: Device, /):
@@ -31,27 +143,24 @@ class TemplateStorage(metaclass=SingletonMeta):
 
         :raises DuplicateIdentifier: If device or template with the same ID already exists.
         """
-        if __device.id in map(lambda x: x.id, self.__devices):
+        if __device.id in self.__devices:
             raise DuplicateIdentifier(
                 "Can't append device to storage because "
                 f"device with id {__device.id!r} already exists"
             )
 
         for device_template in __device:
-            for assigned_device in self.__devices:
-                if any(
-                    map(
-                        lambda assigned_template: assigned_template.id
-                        == device_template.id,
-                        assigned_device,
-                    )
-                ):
-                    raise DuplicateIdentifier(
-                        "Can't append device to storage because "
-                        f"template with id {device_template.id!r} already exists"
-                    )
+            if device_template.id in self.__templates:
+                raise DuplicateIdentifier(
+                    "Can't append device to storage because "
+                    f"template with id {device_template.id!r} already exists"
+                )
 
-        self.__devices.append(__device)
+        self.__devices[__device.id] = __device
+        self._index_device(__device)
+        for device_template in __device:
+            self._index_template(device_template)
+        __device._Device__storage = self  # noqa
 
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
     def remove(self, __device: Device, /):
@@ -61,10 +170,14 @@ class TemplateStorage(metaclass=SingletonMeta):
         :param __device: Device to be removed.
         :raises ValueError: If device is not found in the storage.
         """
-        if __device not in self.__devices:
+        if self.__devices.get(__device.id) is not __device:
             raise ValueError(f"{__device!r} not in storage")
 
-        self.__devices.remove(__device)
+        del self.__devices[__device.id]
+        self._unindex_device(__device)
+        for device_template in __device:
+            self._unindex_template(device_template)
+        __device._Device__storage = None  # noqa
 
     @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
     def import_from_repository(self, __repository: BaseRepository, /):
@@ -95,11 +208,9 @@ class TemplateStorage(metaclass=SingletonMeta):
         :return: Device with the specified ID.
         :raises DeviceNotFound: If device with the specified ID is not found.
         """
-        for device in self:
-            if device.id == __id:
-                return device
-        else:
+        if (device := self.__devices.get(__id)) is None:
             raise DeviceNotFound(f"Device with id {__id!r} is not found")
+        return device
 
     @validate_call
     def get_template_by_id(self, __id: UUID4, /) -> Template:
@@ -110,14 +221,186 @@ class TemplateStorage(metaclass=SingletonMeta):
         :return: Template with the specified ID.
         :raises TemplateNotFound: If template with the specified ID is not found.
         """
-        for device in self:
-            with suppress(TemplateNotFound):
-                return device.get_template_by_id(__id)
-        else:
+        if (template := self.__templates.get(__id)) is None:
             raise TemplateNotFound(f"Template with id {__id!r} is not found")
+        return template
+
+    @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+    def query(
+        self,
+        *,
+        manufacturer: Optional[str] = None,
+        type: Optional[DeviceType] = None,  # noqa
+        color: Optional[Color] = None,
+        emoji: Optional[str] = None,
+        released_from: Optional[date] = None,
+        released_to: Optional[date] = None,
+        min_resolution: Optional[Size2D] = None,
+        max_resolution: Optional[Size2D] = None,
+    ) -> Iterator[Template]:
+        """
+        Find templates matching all the specified filters.
+
+        Every filter is backed by an index. The templates are read lazily
+        from the index with the fewest candidates, and checked against
+        the other filters, so the storage must not be changed
+        while the results are iterated. Devices without a release date
+        don't match release date filters.
+
+        :param manufacturer: Optional. The manufacturer of the device.
+        :param type: Optional. The type of the device.
+        :param color: Optional. The color of the template.
+        :param emoji: Optional. The color family of the template, as in `Color.emoji`.
+        :param released_from: Optional. The earliest release date of the device, inclusive.
+        :param released_to: Optional. The latest release date of the device, inclusive.
+        :param min_resolution: Optional. The size the resolution of the device must be at least.
+        :param max_resolution: Optional. The size the resolution of the device must be at most.
+
+        :return: A lazy iterator over the matching templates.
+        """
+        # estimated number of candidates, lazy candidates and the filter of each index
+        lookups: List[
+            Tuple[float, Iterator[Template], Callable[[Template], bool]]
+        ] = list()
+        # device indexes count devices, weighted by the average number of templates
+        templates_per_device = len(self.__templates) / max(1, len(self.__devices))
+
+        for index, key in ((self.__by_color, color), (self.__by_emoji, emoji)):
+            if key is not None:
+                templates = index.get(key)
+                lookups.append(
+                    (len(templates), iter(templates), templates.__contains__)
+                )
+
+        for index, key in (
+            (self.__by_manufacturer, manufacturer),
+            (self.__by_type, type),
+        ):
+            if key is not None:
+                devices = index.get(key)
+                lookups.append(
+                    (
+                        len(devices) * templates_per_device,
+                        chain.from_iterable(devices),
+                        lambda template, devices=devices: template.device in devices,
+                    )
+                )
+
+        if released_from is not None or released_to is not None:
+
+            def is_released_in_range(template: Template) -> bool:
+                released_at = template.device.released_at
+                return (
+                    released_at is not None
+                    and (released_from is None or released_from <= released_at)
+                    and (released_to is None or released_at <= released_to)
+                )
+
+            count, devices = self.__by_released_at.range(released_from, released_to)
+            lookups.append(
+                (
+                    count * templates_per_device,
+                    chain.from_iterable(devices),
+                    is_released_in_range,
+                )
+            )
+
+        if min_resolution is not None or max_resolution is not None:
+
+            def is_resolution_in_range(template: Template) -> bool:
+                resolution = template.device.resolution
+                return (
+                    min_resolution is None
+                    or (
+                        min_resolution.width <= resolution.width
+                        and min_resolution.height <= resolution.height
+                    )
+                ) and (
+                    max_resolution is None
+                    or (
+                        resolution.width <= max_resolution.width
+                        and resolution.height <= max_resolution.height
+                    )
+                )
+
+            # sizes in range have areas in range, but not every area in range
+            # belongs to a size in range, so the candidates are checked as well
+            count, devices = self.__by_resolution.range(
+                _area(min_resolution) if min_resolution else None,
+                _area(max_resolution) if max_resolution else None,
+            )
+            lookups.append(
+                (
+                    count * templates_per_device,
+                    filter(is_resolution_in_range, chain.from_iterable(devices)),
+                    is_resolution_in_range,
+                )
+            )
+
+        if not lookups:
+            return iter(self.__templates.values())
+
+        lookups.sort(key=lambda lookup: lookup[0])
+        _, candidates, _ = lookups[0]
+        for _, _, is_matching in lookups[1:]:
+            candidates = filter(is_matching, candidates)
+        return candidates
+
+    def _index_device(self, __device: Device, /):
+        """
+        Adds a stored device to the indexes.
+
+        :param __device: The device to add.
+        """
+        self.__by_manufacturer.add(__device.manufacturer, __device)
+        self.__by_type.add(__device.type, __device)
+        if __device.released_at is not None:
+            self.__by_released_at.add(__device.released_at, __device)
+        self.__by_resolution.add(_area(__device.resolution), __device)
+
+    def _unindex_device(self, __device: Device, /):
+        """
+        Removes a stored device from the indexes.
+        Must be called before the indexed fields of the device change.
+
+        :param __device: The device to remove.
+        """
+        self.__by_manufacturer.remove(__device.manufacturer, __device)
+        self.__by_type.remove(__device.type, __device)
+        if __device.released_at is not None:
+            self.__by_released_at.remove(__device.released_at, __device)
+        self.__by_resolution.remove(_area(__device.resolution), __device)
+
+    def _index_template(self, __template: Template, /):
+        """
+        Adds a template of a stored device to the indexes.
+
+        :param __template: The template to add.
+        """
+        self.__templates[__template.id] = __template
+        self.__by_color.add(__template.color, __template)
+        self.__by_emoji.add(__template.color.emoji, __template)
+
+    def _unindex_template(self, __template: Template, /):
+        """
+        Removes a template of a stored device from the indexes.
+        Must be called before the ID or the color of the template change.
+
+        :param __template: The template to remove.
+        """
+        del self.__templates[__template.id]
+        self.__by_color.remove(__template.color, __template)
+        self.__by_emoji.remove(__template.color.emoji, __template)
 
     def __iter__(self) -> Iterator[Device]:
-        return iter(self.__devices)
+        return iter(self.__devices.values())
+
+
+def _area(__size: Size2D, /) -> int:
+    """
+    Gets the number of pixels of a size, the key of the resolution index.
+    """
+    return __size.width * __size.height
 
 
 __all__ = ("TemplateStorage",)
@@ -0,0 +1,75 @@
+from io import BytesIO
+from uuid import uuid4
+
+from PIL import Image
+
+from mockup_engineer import (
+    BytesIOReader,
+    Color,
+    Device,
+    DeviceType,
+    PilRenderer,
+    Point2D,
+    RenderStage,
+    Size2D,
+    Template,
+)
+from mockup_engineer.render_pool import _initialize_worker
+from mockup_engineer.renderers import RenderReport
+
+FRAME_SIZE = Size2D(10, 20)
+# the frame and the base of a plan are "RGBA" images
+PLAN_NBYTES = FRAME_SIZE.width * FRAME_SIZE.height * 8
+
+
+class Renderer(PilRenderer):
+    pass
+
+
+def make_device(colors=("Blue", "Gold")) -> Device:
+    frame = BytesIO()
+    Image.new("RGBA", (FRAME_SIZE.width, FRAME_SIZE.height)).save(frame, "PNG")
+    device = Device(
+        id=uuid4(),
+        manufacturer="Test",
+        name="Phone",
+        type=DeviceType.SMARTPHONE,
+        resolution=Size2D(6, 16),
+        can_rotate=True,
+    )
+    for color in colors:
+        Template(
+            id=uuid4(),
+            color=Color(color),
+            screenshot_start_point=Point2D(2, 2),
+            screenshot_size=Size2D(6, 16),
+            frame=BytesIOReader(BytesIO(frame.getvalue())),
+            device=device,
+        )
+    return device
+
+
+def compile_hits(device: Device):
+    report = RenderReport()
+    Renderer.observer = report
+    try:
+        for template in device:
+            for portrait in (True, False):
+                Renderer.compile(template, portrait=portrait)
+    finally:
+        Renderer.observer = None
+    return [
+        event.cache_hit for event in report.events if event.stage is RenderStage.COMPILE
+    ]
+
+
+def test_preloaded_plans_are_cached():
+    device = make_device()
+    _initialize_worker(Renderer, (device,), True, 4 * PLAN_NBYTES + 1024)
+    assert compile_hits(device) == [True, True, True, True]
+
+
+def test_preload_stops_when_the_frame_cache_is_full():
+    device = make_device()
+    _initialize_worker(Renderer, (device,), True, 3 * PLAN_NBYTES + 1024)
+    assert compile_hits(device) == [True, True, True, False]
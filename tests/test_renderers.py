@@ -0,0 +1,74 @@
+from io import BytesIO
+from uuid import uuid4
+
+import pytest
+from PIL import Image
+
+from mockup_engineer import (
+    BytesIOReader,
+    Color,
+    Device,
+    DeviceType,
+    NumpyRenderer,
+    PilRenderer,
+    Point2D,
+    Size2D,
+    Template,
+)
+from mockup_engineer.renderers import FrameCache
+
+
+def make_template(frame_size: Size2D, screen_size: Size2D) -> Template:
+    frame = BytesIO()
+    Image.new("RGBA", (frame_size.width, frame_size.height)).save(frame, "PNG")
+    device = Device(
+        id=uuid4(),
+        manufacturer="Test",
+        name="Tablet",
+        type=DeviceType.TABLET,
+        resolution=screen_size,
+        can_rotate=True,
+    )
+    return Template(
+        id=uuid4(),
+        color=Color("Blue"),
+        screenshot_start_point=Point2D(4, 2),
+        screenshot_size=screen_size,
+        frame=BytesIOReader(BytesIO(frame.getvalue())),
+        device=device,
+    )
+
+
+@pytest.mark.parametrize("renderer", (PilRenderer, NumpyRenderer))
+@pytest.mark.parametrize("portrait", (True, False))
+@pytest.mark.parametrize(
+    "options",
+    (dict(), dict(scale=0.5), dict(max_size=Size2D(30, 30))),
+)
+def test_templates_size_hint_covers_plans_of_landscape_frames(
+    renderer, portrait, options
+):
+    # the frame is in landscape orientation and its screen in portrait orientation
+    template = make_template(Size2D(80, 40), Size2D(24, 36))
+    plan = renderer.compile(template, portrait=portrait, **options)
+    size_hint = renderer._templates_size_hint(
+        (template,),
+        portrait=portrait,
+        disable_rotate=False,
+        scale=options.get("scale"),
+        max_size=options.get("max_size"),
+    )
+    plan_size_hint = renderer._screenshot_size_hint((plan,))
+    assert size_hint.width >= plan_size_hint.width
+    assert size_hint.height >= plan_size_hint.height
+
+
+def test_estimate_memory_does_not_compile():
+    class Renderer(PilRenderer):
+        frame_cache = FrameCache()
+
+    template = make_template(Size2D(80, 40), Size2D(24, 36))
+    estimate = Renderer.estimate_memory(template, Size2D(240, 360), scale=0.5)
+    # only the probed frame size is cached
+    assert len(Renderer.frame_cache) == 1
+    assert estimate > 0
@@ -0,0 +1,74 @@
+from io import BytesIO
+from uuid import uuid4
+
+import pytest
+
+from mockup_engineer import (
+    BytesIOReader,
+    Color,
+    Device,
+    DeviceType,
+    Point2D,
+    Size2D,
+    Template,
+    TemplateStorage,
+)
+
+
+def make_device(name: str, resolution: Size2D, colors=("Blue", "Gold")) -> Device:
+    device = Device(
+        id=uuid4(),
+        manufacturer="Test",
+        name=name,
+        type=DeviceType.SMARTPHONE,
+        resolution=resolution,
+    )
+    for color in colors:
+        Template(
+            id=uuid4(),
+            color=Color(color),
+            screenshot_start_point=Point2D(0, 0),
+            screenshot_size=resolution,
+            frame=BytesIOReader(BytesIO()),
+            device=device,
+        )
+    return device
+
+
+@pytest.fixture
+def storage():
+    storage = TemplateStorage()
+    devices = [
+        make_device("Tall", Size2D(1200, 2600)),
+        # its area is in the range of the tall device, but its width is not
+        make_device("Wide", Size2D(500, 3000)),
+        make_device("Small", Size2D(300, 400)),
+    ]
+    for device in devices:
+        storage.append(device)
+    yield storage
+    for device in devices:
+        storage.remove(device)
+
+
+def names(templates) -> set:
+    return {template.device.name for template in templates}
+
+
+def test_min_resolution_checks_both_dimensions(storage):
+    assert names(storage.query(min_resolution=Size2D(1000, 1000))) == {"Tall"}
+
+
+def test_min_resolution_checks_both_dimensions_with_other_filters(storage):
+    templates = list(
+        storage.query(min_resolution=Size2D(1000, 1000), color=Color("Blue"))
+    )
+    assert names(templates) == {"Tall"}
+    assert {template.color for template in templates} == {Color("Blue")}
+
+
+def test_max_resolution_checks_both_dimensions(storage):
+    assert names(storage.query(max_resolution=Size2D(1300, 2700))) == {
+        "Tall",
+        "Small",
+    }